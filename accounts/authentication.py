@@ -0,0 +1,88 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import principal_cache_key
+
+# User columns kept in the cached principal. Anything else is left deferred and
+# is loaded from the database only if a view actually touches it.
+PRINCIPAL_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser',
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that builds ``request.user`` from a short-lived cache
+    entry instead of selecting the user row on every request.
+
+    The cached user is a real ``User`` instance with only PRINCIPAL_FIELDS
+    loaded, so ``request.user`` comparisons and ``user=request.user`` filters
+    behave exactly as before. Entries are dropped when the user is saved or
+    deleted (see accounts.signals).
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares against the password hash, which is not cached
+            return super().get_user(validated_token)
+
+        key = principal_cache_key(self.get_user_id(validated_token))
+        values = cache.get(key)
+        if values is None:
+            user = super().get_user(validated_token)
+            cache.set(key, self.principal_values(user), settings.JWT_PRINCIPAL_CACHE_TIMEOUT)
+            return user
+        return self.build_principal(values)
+
+    async def aauthenticate(self, request):
+        """``authenticate`` for plain async Django views."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        key = principal_cache_key(self.get_user_id(validated_token))
+        values = await cache.aget(key)
+        if values is None:
+            user = await sync_to_async(super().get_user)(validated_token)
+            await cache.aset(key, self.principal_values(user), settings.JWT_PRINCIPAL_CACHE_TIMEOUT)
+            return user
+        return self.build_principal(values)
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def principal_values(self, user):
+        return {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+
+    def build_principal(self, values):
+        if not values['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return self.build_user(values)
+
+    def build_user(self, values):
+        fields = [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in values
+        ]
+        return self.user_model.from_db(
+            DEFAULT_DB_ALIAS, fields, [values[field] for field in fields]
+        )
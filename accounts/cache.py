@@ -0,0 +1,2 @@
+def principal_cache_key(user_id):
+    return f'jwt-principal:{user_id}'
@@ -1,3 +1,36 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_user_row_is_read_once_per_cache_window(self):
+        # User lookup + patient page
+        with self.assertNumQueries(2):
+            self.client.get('/api/patients/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/patients/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_cached_principal_owns_created_rows(self):
+        self.client.get('/api/patients/')
+        response = self.client.post('/api/patients/', {
+            'first_name': 'Ada', 'last_name': 'Lovelace', 'date_of_birth': '1990-01-01',
+            'gender': 'F', 'contact_number': '555',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.user.patients.count(), 1)
+
+    def test_saving_the_user_invalidates_the_cache(self):
+        self.client.get('/api/patients/')
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get('/api/patients/')
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,13 @@
+from core.async_api import async_api_view, json_response, paginated_response
+from .filters import AppointmentFilter
+from .models import Appointment
+from .serializers import AppointmentSerializer
+
+
+@async_api_view
+async def appointment_list(request):
+    """Async counterpart of ``GET /api/appointments/``."""
+    filterset = AppointmentFilter(request.GET, queryset=Appointment.objects.all())
+    if not filterset.is_valid():
+        return json_response(filterset.errors, 400)
+    return await paginated_response(request, filterset.qs, AppointmentSerializer)
@@ -0,0 +1,35 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Now
+
+from patients.models import Patient
+from .models import Appointment
+
+
+def adjust_upcoming_appointment_count(patient_id, delta):
+    """Add ``delta`` to one patient's counter in a single UPDATE, never going below zero."""
+    Patient.objects.filter(pk=patient_id).update(
+        upcoming_appointment_count=Greatest(F('upcoming_appointment_count') + delta, Value(0)),
+        updated_at=Now(),
+    )
+
+
+def upcoming_appointment_count_subquery():
+    return Coalesce(Subquery(
+        Appointment.objects.filter(patient=OuterRef('pk'), status='SCHEDULED')
+        .order_by()
+        .values('patient')
+        .annotate(count=Count('pk'))
+        .values('count')
+    ), Value(0))
+
+
+def refresh_upcoming_appointment_counts(patients=None):
+    """
+    Recount ``Patient.upcoming_appointment_count`` from the appointment table
+    with one UPDATE. ``patients`` is a queryset or iterable of ids; every
+    patient when None.
+    """
+    queryset = Patient.objects.all()
+    if patients is not None:
+        queryset = queryset.filter(pk__in=patients)
+    return queryset.update(upcoming_appointment_count=upcoming_appointment_count_subquery(), updated_at=Now())
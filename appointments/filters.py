@@ -0,0 +1,16 @@
+import django_filters
+from .models import Appointment
+
+
+class AppointmentFilter(django_filters.FilterSet):
+    # Filter on the raw foreign key columns so no lookup of the related row is needed
+    doctor = django_filters.NumberFilter(field_name='doctor_id')
+    patient = django_filters.NumberFilter(field_name='patient_id')
+    created_by = django_filters.NumberFilter(field_name='created_by_id')
+    status = django_filters.ChoiceFilter(choices=Appointment.STATUS_CHOICES)
+    # ?appointment_datetime_after=...&appointment_datetime_before=...
+    appointment_datetime = django_filters.IsoDateTimeFromToRangeFilter()
+
+    class Meta:
+        model = Appointment
+        fields = ['doctor', 'patient', 'status', 'created_by', 'appointment_datetime']
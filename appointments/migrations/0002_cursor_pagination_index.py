@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0001_initial"),
+        ("doctors", "0002_cursor_pagination_index"),
+        ("patients", "0002_cursor_pagination_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="appointment_created_13c6bb_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:29
+
+from datetime import timedelta
+
+import django.core.validators
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_end_datetime(apps, schema_editor):
+    Appointment = apps.get_model("appointments", "Appointment")
+    Appointment.objects.update(
+        end_datetime=models.F("appointment_datetime") + timedelta(minutes=30)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0002_cursor_pagination_index"),
+        ("doctors", "0002_cursor_pagination_index"),
+        ("patients", "0002_cursor_pagination_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="appointment",
+            name="duration_minutes",
+            field=models.PositiveIntegerField(
+                default=30,
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(480),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="appointment",
+            name="end_datetime",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_end_datetime, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="appointment",
+            name="end_datetime",
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["doctor", "status", "appointment_datetime"],
+                name="appointment_doctor__666f80_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0003_appointment_duration_and_overlap_index"),
+        ("doctors", "0002_cursor_pagination_index"),
+        ("patients", "0002_cursor_pagination_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["patient", "status", "appointment_datetime"],
+                name="appointment_patient_4a5a57_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["status", "appointment_datetime"],
+                name="appointment_status_9793f5_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["appointment_datetime"], name="appointment_appoint_ff6788_idx"
+            ),
+        ),
+    ]
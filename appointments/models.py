@@ -1,9 +1,37 @@
+from datetime import timedelta
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from doctors.models import Doctor
 from patients.models import Patient
 from django.contrib.auth.models import User
 
 
+# Upper bound on an appointment's length. Overlap lookups rely on it to turn the
+# interval check into a bounded range scan over appointment_datetime.
+MAX_DURATION_MINUTES = 8 * 60
+
+
+class AppointmentQuerySet(models.QuerySet):
+    def scheduled_between(self, start, end):
+        """
+        Scheduled appointments that intersect [start, end).
+
+        Any such appointment must start within MAX_DURATION_MINUTES before
+        ``start``, so combined with a doctor filter the lookup stays a range
+        scan on the (doctor, status, appointment_datetime) index.
+        """
+        return self.filter(
+            status='SCHEDULED',
+            appointment_datetime__gt=start - timedelta(minutes=MAX_DURATION_MINUTES),
+            appointment_datetime__lt=end,
+            end_datetime__gt=start,
+        )
+
+    def overlapping(self, doctor_id, start, end):
+        """Scheduled appointments of the doctor that intersect [start, end)."""
+        return self.filter(doctor_id=doctor_id).scheduled_between(start, end)
+
+
 class Appointment(models.Model):
 
     STATUS_CHOICES = [
@@ -25,6 +53,11 @@ class Appointment(models.Model):
     )
 
     appointment_datetime = models.DateTimeField()
+    duration_minutes = models.PositiveIntegerField(
+        default=30,
+        validators=[MinValueValidator(1), MaxValueValidator(MAX_DURATION_MINUTES)]
+    )
+    end_datetime = models.DateTimeField(editable=False)
     reason = models.TextField(blank=True)
     status = models.CharField(
         max_length=20,
@@ -40,5 +73,30 @@ class Appointment(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = AppointmentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['doctor', 'status', 'appointment_datetime']),
+            models.Index(fields=['patient', 'status', 'appointment_datetime']),
+            models.Index(fields=['status', 'appointment_datetime']),
+            models.Index(fields=['appointment_datetime']),
+        ]
+
     def __str__(self):
         return f"{self.patient} with {self.doctor} on {self.appointment_datetime}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The patient whose upcoming_appointment_count currently includes this row
+        instance._counted_patient_id = instance.patient_id if instance.status == 'SCHEDULED' else None
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.end_datetime = self.appointment_datetime + timedelta(minutes=self.duration_minutes)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'appointment_datetime', 'duration_minutes'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'end_datetime'}
+        super().save(*args, **kwargs)
@@ -1,4 +1,8 @@
+from datetime import timedelta
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from doctors.models import Doctor
 from .models import Appointment
 
 
@@ -8,20 +12,43 @@ class AppointmentSerializer(serializers.ModelSerializer):
         fields = "__all__"
         read_only_fields = ["created_by"]
 
-    def validate(self, data):
-        doctor = data.get("doctor")
-        appointment_datetime = data.get("appointment_datetime")
+    def create(self, validated_data):
+        with transaction.atomic():
+            self.check_conflicts(
+                validated_data["doctor"].pk,
+                validated_data["appointment_datetime"],
+                validated_data.get("duration_minutes", 30),
+            )
+            return super().create(validated_data)
 
-        if self.instance is None:  # CREATE only
-            conflict = Appointment.objects.filter(
-                doctor=doctor,
-                appointment_datetime=appointment_datetime,
-                status="SCHEDULED"
-            ).exists()
+    def update(self, instance, validated_data):
+        rescheduled = {"doctor", "appointment_datetime", "duration_minutes", "status"} & set(validated_data)
+        status = validated_data.get("status", instance.status)
 
-            if conflict:
-                raise serializers.ValidationError(
-                    "Doctor already has an appointment at this time."
+        with transaction.atomic():
+            if rescheduled and status == "SCHEDULED":
+                doctor = validated_data.get("doctor")
+                self.check_conflicts(
+                    doctor.pk if doctor else instance.doctor_id,
+                    validated_data.get("appointment_datetime", instance.appointment_datetime),
+                    validated_data.get("duration_minutes", instance.duration_minutes),
+                    exclude_pk=instance.pk,
                 )
+            return super().update(instance, validated_data)
+
+    def check_conflicts(self, doctor_id, start, duration_minutes, exclude_pk=None):
+        # Lock the doctor row so concurrent bookings for the same doctor run the
+        # overlap check one at a time instead of check-then-insert racing.
+        Doctor.objects.select_for_update().filter(pk=doctor_id).values_list("pk").first()
 
-        return data
+        end = start + timedelta(minutes=duration_minutes)
+        conflicts = Appointment.objects.overlapping(doctor_id, start, end)
+        if exclude_pk is not None:
+            conflicts = conflicts.exclude(pk=exclude_pk)
+
+        if conflicts.exists():
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    "Doctor already has an appointment at this time."
+                ]
+            })
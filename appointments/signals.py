@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .counters import adjust_upcoming_appointment_count
+from .models import Appointment
+
+
+@receiver(post_save, sender=Appointment)
+def update_upcoming_appointment_count(sender, instance, **kwargs):
+    # Rows loaded from the database remember which patient they were counted
+    # against (see Appointment.from_db); new rows start uncounted
+    old = getattr(instance, '_counted_patient_id', None)
+    new = instance.patient_id if instance.status == 'SCHEDULED' else None
+    if old == new:
+        return
+    if old is not None:
+        adjust_upcoming_appointment_count(old, -1)
+    if new is not None:
+        adjust_upcoming_appointment_count(new, 1)
+    instance._counted_patient_id = new
+
+
+@receiver(post_delete, sender=Appointment)
+def release_upcoming_appointment_count(sender, instance, **kwargs):
+    old = getattr(instance, '_counted_patient_id', None)
+    if old is not None:
+        adjust_upcoming_appointment_count(old, -1)
+        instance._counted_patient_id = None
@@ -1,3 +1,215 @@
-from django.test import TestCase
+import json
+from datetime import date, datetime, timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from core import renderers
+from core.idempotency import IN_PROGRESS, idempotency_cache_key, request_fingerprint
+from doctors.models import Doctor
+from patients.models import Patient
+from .models import Appointment
+from .serializers import AppointmentSerializer
+
+
+class AppointmentTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.doctor = Doctor.objects.create(
+            user=self.user, first_name='Greg', last_name='House',
+            specialization='GP', contact_number='555', license_number='LIC1',
+            hospital='General',
+        )
+        self.patient = Patient.objects.create(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+
+    def book(self, start, **extra):
+        payload = {
+            'doctor': self.doctor.id,
+            'patient': self.patient.id,
+            'appointment_datetime': start,
+            **extra,
+        }
+        return self.client.post('/api/appointments/', payload, format='json')
+
+
+class AppointmentConflictTests(AppointmentTestCase):
+    def test_end_datetime_is_derived_from_duration(self):
+        response = self.book('2030-01-01T10:00:00Z', duration_minutes=45)
+        self.assertEqual(response.status_code, 201)
+        appointment = Appointment.objects.get(pk=response.data['id'])
+        self.assertEqual(appointment.end_datetime, datetime(2030, 1, 1, 10, 45, tzinfo=timezone.utc))
+
+    def test_overlapping_booking_is_rejected(self):
+        self.assertEqual(self.book('2030-01-01T10:00:00Z', duration_minutes=60).status_code, 201)
+
+        response = self.book('2030-01-01T10:30:00Z')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['non_field_errors'],
+            ['Doctor already has an appointment at this time.'],
+        )
+        self.assertEqual(self.book('2030-01-01T09:45:00Z').status_code, 400)
+
+    def test_adjacent_and_cancelled_slots_are_free(self):
+        first = self.book('2030-01-01T10:00:00Z')
+        self.assertEqual(self.book('2030-01-01T10:30:00Z').status_code, 201)
+        self.assertEqual(self.book('2030-01-01T09:30:00Z').status_code, 201)
+
+        self.client.patch(f"/api/appointments/{first.data['id']}/", {'status': 'CANCELLED'}, format='json')
+        self.assertEqual(self.book('2030-01-01T10:00:00Z').status_code, 201)
+
+    def test_rescheduling_into_a_taken_slot_is_rejected(self):
+        self.book('2030-01-01T10:00:00Z')
+        other = self.book('2030-01-01T12:00:00Z')
+
+        url = f"/api/appointments/{other.data['id']}/"
+        response = self.client.patch(url, {'appointment_datetime': '2030-01-01T10:15:00Z'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.patch(url, {'duration_minutes': 90}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class AppointmentFilterTests(AppointmentTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_doctor = Doctor.objects.create(
+            user=self.user, first_name='James', last_name='Wilson',
+            specialization='CAR', contact_number='555', license_number='LIC2',
+            hospital='General',
+        )
+        self.book('2030-01-01T10:00:00Z')
+        self.book('2030-01-02T10:00:00Z', status='COMPLETED')
+        self.book('2030-01-03T10:00:00Z', doctor=self.other_doctor.id)
+
+    def dates(self, **params):
+        response = self.client.get('/api/appointments/', params)
+        self.assertEqual(response.status_code, 200)
+        return {row['appointment_datetime'][:10] for row in response.data['results']}
+
+    def test_filters_are_applied_in_sql(self):
+        self.assertEqual(self.dates(doctor=self.other_doctor.id), {'2030-01-03'})
+        self.assertEqual(self.dates(status='COMPLETED'), {'2030-01-02'})
+        self.assertEqual(self.dates(patient=self.patient.id, doctor=self.doctor.id), {'2030-01-01', '2030-01-02'})
+        self.assertEqual(
+            self.dates(appointment_datetime_after='2030-01-02T00:00:00Z',
+                     appointment_datetime_before='2030-01-02T23:59:59Z'),
+            {'2030-01-02'},
+        )
+        self.assertEqual(self.dates(created_by=self.user.id + 1), set())
+
+
+class AppointmentExportTests(AppointmentTestCase):
+    def test_export_streams_filtered_rows(self):
+        self.book('2030-01-01T10:00:00Z')
+        self.book('2030-01-02T10:00:00Z', status='CANCELLED')
+
+        response = self.client.get('/api/appointments/export/', {'status': 'SCHEDULED'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:4], ['id', 'doctor', 'patient', 'appointment_datetime'])
+        self.assertEqual(len(lines), 2)
+        self.assertIn('2030-01-01T10:00:00Z', lines[1])
+
+    def test_export_as_ndjson(self):
+        self.book('2030-01-01T10:00:00Z')
+
+        response = self.client.get('/api/appointments/export/', {'format': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(rows[0]['doctor'], self.doctor.id)
+        self.assertEqual(rows[0]['end_datetime'], '2030-01-01T10:30:00Z')
+
+
+class UpcomingAppointmentCountTests(AppointmentTestCase):
+    def count(self):
+        return Patient.objects.get(pk=self.patient.pk).upcoming_appointment_count
+
+    def test_counter_follows_status_changes(self):
+        first = self.book('2030-01-01T10:00:00Z')
+        second = self.book('2030-01-01T11:00:00Z')
+        self.assertEqual(self.count(), 2)
+
+        self.client.patch(f"/api/appointments/{first.data['id']}/", {'status': 'COMPLETED'}, format='json')
+        self.assertEqual(self.count(), 1)
+        self.client.patch(f"/api/appointments/{first.data['id']}/", {'status': 'SCHEDULED'}, format='json')
+        self.assertEqual(self.count(), 2)
+
+        self.client.delete(f"/api/appointments/{second.data['id']}/")
+        self.assertEqual(self.count(), 1)
+        self.assertEqual(self.client.get(f'/api/patients/{self.patient.id}/').data['upcoming_appointment_count'], 1)
+
+
+class AppointmentListFastPathTests(AppointmentTestCase):
+    def test_list_bytes_match_the_model_serializer(self):
+        self.book('2030-01-01T10:00:00Z', reason='Line break "quoted" éè \U0001F600\n')
+        self.book('2030-01-01T11:00:00.123456Z', status='CANCELLED', duration_minutes=45)
+
+        expected = JSONRenderer().render({
+            'next': None,
+            'previous': None,
+            'results': AppointmentSerializer(Appointment.objects.order_by('-created_at', '-id'), many=True).data,
+        })
+        self.assertEqual(self.client.get('/api/appointments/').content, expected)
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(self.client.get('/api/appointments/').content, expected)
+
+
+class IdempotencyKeyTests(AppointmentTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def book_once(self, start, key='retry-1'):
+        payload = {'doctor': self.doctor.id, 'patient': self.patient.id, 'appointment_datetime': start}
+        return self.client.post('/api/appointments/', payload, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_the_first_response_without_queries(self):
+        first = self.book_once('2030-01-01T10:00:00Z')
+        self.assertEqual(first.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', first)
+
+        with self.assertNumQueries(0):
+            retry = self.book_once('2030-01-01T10:00:00Z')
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(Appointment.objects.count(), 1)
+
+    def test_reusing_a_key_for_another_request_is_rejected(self):
+        self.assertEqual(self.book_once('2030-01-01T10:00:00Z').status_code, 201)
+        self.assertEqual(self.book_once('2030-01-02T10:00:00Z').status_code, 422)
+        # Keys are scoped to the user
+        other = User.objects.create_user(username='other', password='pass12345')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.book_once('2030-01-02T10:00:00Z').status_code, 201)
+
+    def test_failed_requests_release_the_key(self):
+        self.assertEqual(self.book('2030-01-01T10:00:00Z').status_code, 201)
+        self.assertEqual(self.book_once('2030-01-01T10:00:00Z').status_code, 400)
+        response = self.book_once('2030-01-01T11:00:00Z')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+
+    def test_retry_while_the_first_request_runs_gets_a_conflict(self):
+        payload = json.dumps({
+            'doctor': self.doctor.id, 'patient': self.patient.id, 'appointment_datetime': '2030-01-01T10:00:00Z',
+        })
+        first = RequestFactory().post('/api/appointments/', payload, content_type='application/json')
+        cache.set(idempotency_cache_key(self.user.id, 'retry-1'), (request_fingerprint(first), IN_PROGRESS))
+
+        response = self.client.post(
+            '/api/appointments/', payload, content_type='application/json', HTTP_IDEMPOTENCY_KEY='retry-1',
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertFalse(Appointment.objects.exists())
@@ -1,30 +1,18 @@
-from django.shortcuts import render
-
 from rest_framework.viewsets import ModelViewSet
+from core.export import ExportMixin
+from core.fastpath import FastListMixin
+from core.idempotency import IdempotentCreateMixin
+from .filters import AppointmentFilter
 from .models import Appointment
 from .serializers import AppointmentSerializer
 
 
-class AppointmentViewSet(ModelViewSet):
+class AppointmentViewSet(IdempotentCreateMixin, ExportMixin, FastListMixin, ModelViewSet):
     queryset = Appointment.objects.all()
     serializer_class = AppointmentSerializer
-
-    # For dynamic viewing
-    def querysat(self):
-        queryset = super().get_queryset()
-        params = self.request.query_params
-
-        doctor = params.get("doctor")
-        patient = params.get("patient")
-        status = params.get("status")
-
-        if doctor:
-            queryset = queryset.filter(doctor_id = doctor)
-        if patient:
-            queryset = queryset.filter(doctor_id = doctor)
-        if status:
-            queryset = queryset.filter(doctor_id = doctor)
-        return queryset
+    filterset_class = AppointmentFilter
+    export_fields = ('id', 'doctor', 'patient', 'appointment_datetime', 'duration_minutes',
+                     'end_datetime', 'status', 'reason', 'created_by', 'created_at')
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
\ No newline at end of file
+        serializer.save(created_by=self.request.user)
@@ -0,0 +1,207 @@
+"""
+Read throughput and tail latency of the WSGI and ASGI deployments.
+
+    pip install gunicorn uvicorn
+    python benchmarks/asgi_vs_wsgi.py
+    python benchmarks/asgi_vs_wsgi.py --concurrency 64 --requests 4000 --workers 2
+    python benchmarks/asgi_vs_wsgi.py --scenarios wsgi async --endpoints patients doctors
+
+Seeds a scratch SQLite database (sqlite-tuned profile), then for every
+scenario starts the server in a subprocess and drives each endpoint with
+keep-alive connections from a pool of client threads:
+
+    wsgi   gunicorn (gthread) serving the DRF views, healthcare/wsgi.py
+    asgi   uvicorn serving the same DRF views, healthcare/asgi.py
+    async  uvicorn serving the async views under /api/async/
+
+Prints one JSON line per scenario and endpoint. The client runs in this
+process, so on small machines keep --concurrency modest or it becomes the
+bottleneck.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = {
+    'patients': 'patients/',
+    'doctors': 'doctors/',
+    'mappings': 'mappings/patient/{patient}/',
+    'appointments': 'appointments/',
+}
+
+
+def seed(args):
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'healthcare.settings')
+
+    import django
+    django.setup()
+
+    from datetime import datetime, timedelta, timezone
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from rest_framework_simplejwt.tokens import AccessToken
+    from appointments.models import Appointment
+    from doctors.models import Doctor
+    from mappings.models import PatientDoctorMapping
+    from patients.models import Patient
+
+    call_command('migrate', verbosity=0)
+    user = User.objects.create_user(username='bench')
+    patients = Patient.objects.bulk_create(
+        Patient(
+            user=user, first_name=f'Bench{i}', last_name='Patient', date_of_birth='1990-01-01',
+            gender='O', contact_number='555',
+        )
+        for i in range(args.rows)
+    )
+    doctors = Doctor.objects.bulk_create(
+        Doctor(
+            user=user, first_name=f'Bench{i}', last_name='Doctor', specialization='GP',
+            contact_number='555', license_number=f'BENCH-{i}', hospital='Bench',
+        )
+        for i in range(args.rows)
+    )
+    PatientDoctorMapping.objects.bulk_create(
+        PatientDoctorMapping(patient=patients[0], doctor=doctor, assigned_by=user) for doctor in doctors[:20]
+    )
+    base = datetime(2100, 1, 1, tzinfo=timezone.utc)
+    Appointment.objects.bulk_create(
+        Appointment(
+            doctor=doctors[i % len(doctors)], patient=patients[i % len(patients)], created_by=user,
+            appointment_datetime=base + timedelta(hours=i), end_datetime=base + timedelta(hours=i, minutes=30),
+        )
+        for i in range(args.rows)
+    )
+    call_command('rebuild_counters', verbosity=0)
+    print(json.dumps({'token': str(AccessToken.for_user(user)), 'patient': patients[0].pk}))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(scenario, port, args, env):
+    if scenario == 'wsgi':
+        command = [
+            sys.executable, '-m', 'gunicorn', 'healthcare.wsgi:application',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(args.workers),
+            '--worker-class', 'gthread', '--threads', str(args.threads), '--log-level', 'warning',
+        ]
+    else:
+        command = [
+            sys.executable, '-m', 'uvicorn', 'healthcare.asgi:application',
+            '--host', '127.0.0.1', '--port', str(port), '--workers', str(args.workers),
+            '--log-level', 'warning', '--no-access-log',
+        ]
+        env = {**env, 'SERVER_INTERFACE': 'asgi'}
+    server = subprocess.Popen(command, cwd=BASE_DIR, env=env)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f'{scenario} server did not start on port {port}')
+
+
+def drive(port, path, token, args):
+    counter = itertools.count()
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        timings, failed = [], 0
+        while next(counter) < args.requests:
+            started = time.perf_counter()
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            timings.append(time.perf_counter() - started)
+            if response.status != 200:
+                failed += 1
+        connection.close()
+        with lock:
+            latencies.extend(timings)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    percentile = lambda p: round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'req_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', default=['wsgi', 'asgi', 'async'], choices=['wsgi', 'asgi', 'async'])
+    parser.add_argument('--endpoints', nargs='+', default=list(ENDPOINTS), choices=list(ENDPOINTS))
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=8, help='gunicorn threads per worker (wsgi only)')
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--seed', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args)
+        return
+
+    with tempfile.TemporaryDirectory() as scratch:
+        env = {**os.environ, 'DB_PROFILE': 'sqlite-tuned', 'DB_NAME': os.path.join(scratch, 'bench.sqlite3')}
+        seeded = subprocess.run(
+            [sys.executable, __file__, '--seed', '--rows', str(args.rows)],
+            env=env, check=True, capture_output=True, text=True,
+        )
+        fixture = json.loads(seeded.stdout.strip().splitlines()[-1])
+
+        for scenario in args.scenarios:
+            port = free_port()
+            server = start_server(scenario, port, args, env)
+            try:
+                prefix = '/api/async/' if scenario == 'async' else '/api/'
+                for endpoint in args.endpoints:
+                    path = prefix + ENDPOINTS[endpoint].format(patient=fixture['patient'])
+                    drive(port, path, fixture['token'], args)  # warm up caches and connections
+                    result = drive(port, path, fixture['token'], args)
+                    print(json.dumps({
+                        'scenario': scenario, 'endpoint': endpoint, 'concurrency': args.concurrency, **result,
+                    }), flush=True)
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == '__main__':
+    main()
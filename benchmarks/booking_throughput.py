@@ -0,0 +1,126 @@
+"""
+Booking throughput under each database profile (see DB_PROFILE in settings).
+
+    python benchmarks/booking_throughput.py
+    python benchmarks/booking_throughput.py --threads 16 --bookings 4000 --doctors 4
+    python benchmarks/booking_throughput.py --profiles sqlite sqlite-tuned postgres
+
+SQLite profiles run against a scratch file in a temporary directory. The
+postgres profile uses the DB_* environment variables and writes to that
+database, so point it at a scratch database. Each profile runs in its own
+subprocess and prints one JSON line; bookings go through AppointmentSerializer,
+so they include validation, the doctor row lock and the overlap check.
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def run_worker(args):
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'healthcare.settings')
+
+    import django
+    django.setup()
+
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import OperationalError, connection
+    from appointments.serializers import AppointmentSerializer
+    from doctors.models import Doctor
+    from patients.models import Patient
+
+    call_command('migrate', verbosity=0)
+    stamp = time.time_ns()
+    user = User.objects.create_user(username=f'bench-{stamp}')
+    patient = Patient.objects.create(
+        user=user, first_name='Bench', last_name='Patient', date_of_birth='1990-01-01',
+        gender='O', contact_number='555',
+    )
+    doctors = [
+        Doctor.objects.create(
+            user=user, first_name='Bench', last_name=str(i), specialization='GP',
+            contact_number='555', license_number=f'BENCH-{stamp}-{i}', hospital='Bench',
+        ).pk
+        for i in range(args.doctors)
+    ]
+    connection.close()
+
+    # Every booking gets its own slot; doctors are shared so threads contend on the row lock
+    base = datetime(2100, 1, 1, tzinfo=timezone.utc) + timedelta(days=stamp % 10000)
+    counter = itertools.count()
+    booked, failed = [0], [0]
+    lock = threading.Lock()
+
+    def book():
+        while (n := next(counter)) < args.bookings:
+            serializer = AppointmentSerializer(data={
+                'doctor': doctors[n % len(doctors)],
+                'patient': patient.pk,
+                'appointment_datetime': base + timedelta(minutes=30 * (n // len(doctors))),
+            })
+            try:
+                serializer.is_valid(raise_exception=True)
+                serializer.save(created_by=user)
+                outcome = booked
+            except OperationalError:
+                outcome = failed
+            with lock:
+                outcome[0] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=book) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        'profile': os.environ.get('DB_PROFILE', 'sqlite'),
+        'threads': args.threads,
+        'bookings': booked[0],
+        'errors': failed[0],
+        'seconds': round(elapsed, 3),
+        'bookings_per_sec': round(booked[0] / elapsed, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', nargs='+', default=['sqlite', 'sqlite-tuned'])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--bookings', type=int, default=2000)
+    parser.add_argument('--doctors', type=int, default=4)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    worker_args = [
+        '--worker', '--threads', str(args.threads),
+        '--bookings', str(args.bookings), '--doctors', str(args.doctors),
+    ]
+    with tempfile.TemporaryDirectory() as scratch:
+        for profile in args.profiles:
+            env = {**os.environ, 'DB_PROFILE': profile}
+            if profile.startswith('sqlite'):
+                env['DB_NAME'] = os.path.join(scratch, f'{profile}.sqlite3')
+            subprocess.run([sys.executable, __file__, *worker_args], env=env, check=True)
+
+
+if __name__ == '__main__':
+    main()
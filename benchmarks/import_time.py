@@ -0,0 +1,86 @@
+"""
+Startup import cost of the project.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --command migrate --plan --top 20 --runs 5
+
+Runs ``python -X importtime manage.py <command>`` in a fresh interpreter
+(``check`` by default, which also loads the URLconf and every view) and
+prints one JSON line: the median wall time, the cumulative import time of
+each top-level package and the slowest project modules. Compare the output
+before and after a change to track startup cost.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PROJECT_PACKAGES = {'accounts', 'appointments', 'core', 'doctors', 'healthcare', 'mappings', 'patients'}
+
+
+def parse_importtime(stderr):
+    """Yield (module, self_us, cumulative_us, depth) from ``-X importtime`` output."""
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        yield name.strip(), int(self_us), int(cumulative_us), depth
+
+
+def run_once(command):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', 'manage.py', *command],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    return time.perf_counter() - started, list(parse_importtime(result.stderr))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--command', nargs='+', default=['check'], help='manage.py command and arguments')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10)
+    args, extra = parser.parse_known_args()
+    command = args.command + extra
+
+    walls, runs = [], []
+    for _ in range(args.runs):
+        wall, modules = run_once(command)
+        walls.append(wall)
+        runs.append(modules)
+
+    # Report the run with the median wall time so the breakdown matches the headline number
+    median = sorted(range(args.runs), key=walls.__getitem__)[args.runs // 2]
+    modules = runs[median]
+
+    packages = defaultdict(int)
+    for name, self_us, _, _ in modules:
+        packages[name.partition('.')[0]] += self_us
+    project = sorted(
+        ((name, cumulative_us) for name, _, cumulative_us, _ in modules
+         if name.partition('.')[0] in PROJECT_PACKAGES),
+        key=lambda item: -item[1],
+    )
+
+    print(json.dumps({
+        'command': ' '.join(command),
+        'wall_ms': round(statistics.median(walls) * 1000, 1),
+        'imports_ms': round(sum(self_us for _, self_us, _, _ in modules) / 1000, 1),
+        'modules': len(modules),
+        'packages_ms': {
+            name: round(us / 1000, 1)
+            for name, us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]
+        },
+        'project_modules_ms': {name: round(us / 1000, 1) for name, us in project[:args.top]},
+    }))
+
+
+if __name__ == '__main__':
+    main()
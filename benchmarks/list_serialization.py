@@ -0,0 +1,144 @@
+"""
+Rows/sec of the list serializers: ModelSerializer vs the values_list fast path.
+
+    python benchmarks/list_serialization.py
+    python benchmarks/list_serialization.py --rows 10000 --repeat 5
+
+Seeds a scratch SQLite database with --rows patients, doctors and appointments
+and times each list serializer three ways, fetch + serialize + render:
+
+    model_serializer  queryset of model instances, Serializer(many=True).data, JSONRenderer
+    fast_path         values_list(named=True), core.fastpath.ListPlan, JSONRenderer
+    fast_path_orjson  as fast_path, rendered with orjson via FastJSONRenderer (if installed)
+
+Every variant's bytes are compared with model_serializer's before timing.
+Prints one JSON line per serializer with the best of --repeat runs.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup(rows):
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'healthcare.settings')
+
+    import django
+    django.setup()
+
+    from datetime import datetime, timedelta, timezone
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from appointments.models import Appointment
+    from doctors.models import Doctor
+    from patients.models import Patient
+
+    call_command('migrate', verbosity=0)
+    user = User.objects.create_user(username='bench')
+    patients = Patient.objects.bulk_create(
+        Patient(
+            user=user, first_name=f'Bench{i}', last_name='Patient', date_of_birth='1990-01-01',
+            gender='O', contact_number='555', email=f'bench{i}@example.com',
+        )
+        for i in range(rows)
+    )
+    doctors = Doctor.objects.bulk_create(
+        Doctor(
+            user=user, first_name=f'Bench{i}', last_name='Doctor', specialization='GP',
+            contact_number='555', license_number=f'BENCH-{i}', hospital='Bench',
+        )
+        for i in range(rows)
+    )
+    base = datetime(2100, 1, 1, tzinfo=timezone.utc)
+    Appointment.objects.bulk_create(
+        Appointment(
+            doctor=doctors[i], patient=patients[i], created_by=user, reason='Routine follow-up',
+            appointment_datetime=base + timedelta(hours=i), end_datetime=base + timedelta(hours=i, minutes=30),
+        )
+        for i in range(rows)
+    )
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        os.environ['DB_NAME'] = os.path.join(scratch, 'bench.sqlite3')
+        os.environ.pop('DB_PROFILE', None)
+        setup(args.rows)
+
+        from rest_framework.renderers import JSONRenderer
+        from appointments.models import Appointment
+        from appointments.serializers import AppointmentSerializer
+        from doctors.models import Doctor
+        from doctors.serializers import DoctorListSerializer
+        from core import renderers
+        from core.fastpath import ListPlan
+        from patients.models import Patient
+        from patients.serializers import PatientListSerializer
+
+        json_renderer = JSONRenderer()
+        fast_renderer = renderers.FastJSONRenderer()
+        ordering = ('-created_at', '-id')
+
+        for model, serializer_class in (
+            (Patient, PatientListSerializer),
+            (Doctor, DoctorListSerializer),
+            (Appointment, AppointmentSerializer),
+        ):
+            queryset = model.objects.order_by(*ordering)
+            if model is Patient:
+                queryset = queryset.with_age(date.today())
+            plan = ListPlan.for_serializer(serializer_class)
+
+            def model_serializer():
+                return json_renderer.render(serializer_class(list(queryset), many=True).data)
+
+            def fast_path():
+                rows = list(queryset.values_list(*plan.columns, named=True))
+                return json_renderer.render(plan.serialize(rows, serializer_class()))
+
+            def fast_path_orjson():
+                rows = list(queryset.values_list(*plan.columns, named=True))
+                return fast_renderer.render(
+                    plan.serialize(rows, serializer_class()), renderer_context={'fast_path': True},
+                )
+
+            variants = {'model_serializer': model_serializer, 'fast_path': fast_path}
+            if renderers.orjson is not None:
+                variants['fast_path_orjson'] = fast_path_orjson
+
+            expected = model_serializer()
+            result = {'serializer': serializer_class.__name__, 'rows': args.rows}
+            for name, func in variants.items():
+                if func() != expected:
+                    raise SystemExit(f'{serializer_class.__name__}: {name} output differs')
+                result[f'{name}_rows_per_sec'] = round(args.rows / best_of(args.repeat, func))
+            result['speedup'] = round(
+                max(value for key, value in result.items() if key.startswith('fast_path'))
+                / result['model_serializer_rows_per_sec'], 2,
+            )
+            print(json.dumps(result), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""
+End-to-end load test of the API routes, saved as a JSON baseline to diff between commits.
+
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --patients 200000 --appointments 1000000 --database big.sqlite3
+    python benchmarks/load_test.py --concurrency 16 --requests 1000 --scenarios patients doctor_patients
+    python benchmarks/load_test.py --output baseline.json
+    python benchmarks/load_test.py --compare baseline.json
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --username synthetic-42-0
+
+By default the data is generated with ``manage.py generate_data`` into a
+scratch SQLite database (sqlite-tuned profile), or into --database if that
+file does not exist yet. The routes in healthcare/urls.py are then driven
+in-process through Django's test client from --concurrency threads, with
+DEBUG off. With --url the harness drives a running server over keep-alive
+HTTP connections instead. It logs in as --username, whose data is then
+generated with the same --seed.
+
+Each scenario gets --warmup requests and then --requests timed requests. One
+JSON document is printed (and written to --output) with throughput, latency
+percentiles and queries per request per scenario. Query counts come from the
+Server-Timing header (core.metrics). They are always on in-process; for
+--url, start the server with REQUEST_METRICS=1. --compare prints the change
+against an earlier baseline.
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# name: (method, path); {patient} and {doctor} are filled in from the logged-in user's data
+SCENARIOS = {
+    'patients': ('GET', '/api/patients/'),
+    'patients_by_age': ('GET', '/api/patients/?age_min=65&ordering=-age'),
+    'patient_search': ('GET', '/api/patients/?q=ma'),
+    'patient_doctors': ('GET', '/api/patients/{patient}/doctors/'),
+    'doctors': ('GET', '/api/doctors/?specialization=CAR'),
+    'doctor_patients': ('GET', '/api/doctors/{doctor}/patients/'),
+    'mappings': ('GET', '/api/mappings/'),
+    'appointments': ('GET', '/api/appointments/?doctor={doctor}&status=SCHEDULED'),
+    'book': ('POST', '/api/appointments/'),
+}
+QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+class ClientTransport:
+    """Django test client per thread, against this process's database."""
+
+    def __init__(self):
+        from django.test import Client
+        self.local = threading.local()
+        self.client_class = Client
+
+    def request(self, method, path, body=None, headers=None):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.client_class(HTTP_HOST='localhost')
+        response = client.generic(
+            method, path, json.dumps(body) if body is not None else '',
+            content_type='application/json', headers=headers,
+        )
+        return response.status_code, response.headers.get('Server-Timing', ''), response.content
+
+    def close(self):
+        from django.db import connections
+        connections.close_all()
+
+
+class HTTPTransport:
+    """Keep-alive HTTP connection per thread to a running server."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        headers = {**(headers or {}), 'Content-Type': 'application/json'}
+        connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = connection.getresponse()
+        content = response.read()
+        return response.status, response.getheader('Server-Timing', ''), content
+
+    def close(self):
+        pass
+
+
+def setup_database(args):
+    """Configure Django in this process on a generated SQLite database."""
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'healthcare.settings'
+    os.environ['DB_PROFILE'] = 'sqlite-tuned'
+    os.environ['DB_NAME'] = args.database
+    os.environ['REQUEST_METRICS'] = '1'
+    os.environ.pop('DB_REPLICA_NAME', None)
+
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.contrib.auth.models import User
+
+    # Measure what production runs: no per-query debug logging
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['localhost']
+
+    call_command('migrate', verbosity=0)
+    if not User.objects.filter(username=args.username).exists():
+        call_command(
+            'generate_data', seed=args.seed, users=args.users, patients=args.patients, doctors=args.doctors,
+            appointments=args.appointments, password=args.password, stdout=sys.stderr,
+        )
+    from django.db import connections
+    connections.close_all()
+
+
+def login(transport, args):
+    status, _, content = transport.request(
+        'POST', '/api/token/', {'username': args.username, 'password': args.password},
+    )
+    if status != 200:
+        raise SystemExit(f'Login as {args.username} failed ({status}): {content[:200]!r}')
+    return {'Authorization': f'Bearer {json.loads(content)["access"]}'}
+
+
+def first_id(transport, headers, path):
+    status, _, content = transport.request('GET', path, headers=headers)
+    results = json.loads(content)['results'] if status == 200 else []
+    if not results:
+        raise SystemExit(f'No rows at {path} for this user; generate data first.')
+    return results[0]['id']
+
+
+def care_team_doctor(transport, headers, patient):
+    """A doctor on the patient's care team, else any doctor."""
+    status, _, content = transport.request('GET', f'/api/patients/{patient}/doctors/', headers=headers)
+    mappings = json.loads(content) if status == 200 else []
+    if mappings:
+        return mappings[0]['doctor']
+    return first_id(transport, headers, '/api/doctors/?page_size=1')
+
+
+def run_scenario(transport, headers, name, fixture, args):
+    method, template = SCENARIOS[name]
+    path = template.format(**fixture)
+    counter = itertools.count()
+    # Bookings take distinct half-hour slots far in the future so none conflict
+    base = datetime(2100, 1, 1, tzinfo=timezone.utc) + timedelta(days=fixture['run'] % 10000)
+
+    def body(n):
+        if method != 'POST':
+            return None
+        return {
+            'doctor': fixture['doctor'], 'patient': fixture['patient'],
+            'appointment_datetime': (base + timedelta(minutes=30 * n)).isoformat(),
+        }
+
+    def drive(total):
+        latencies, queries, errors = [], [], [0]
+        lock = threading.Lock()
+
+        def client():
+            timings, counts, failed = [], [], 0
+            while (n := next(counter)) < total:
+                started = time.perf_counter()
+                status, timing, _ = transport.request(method, path, body(n), headers)
+                timings.append(time.perf_counter() - started)
+                if status >= 400:
+                    failed += 1
+                match = QUERIES.search(timing)
+                if match:
+                    counts.append(int(match.group(1)))
+            with lock:
+                latencies.extend(timings)
+                queries.extend(counts)
+                errors[0] += failed
+
+        threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, queries, errors[0], time.perf_counter() - started
+
+    drive(args.warmup)
+    counter = itertools.count(args.warmup)
+    latencies, queries, errors, elapsed = drive(args.warmup + args.requests)
+
+    latencies.sort()
+    percentile = lambda p: round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+    return {
+        'path': f'{method} {path}',
+        'requests': len(latencies),
+        'errors': errors,
+        'req_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+        'max_queries': max(queries) if queries else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, result):
+    """One line per scenario with the relative change of the headline numbers."""
+    def change(key, old, new):
+        if not old.get(key) or new.get(key) is None:
+            return f'{key} n/a'
+        return f'{key} {old[key]} -> {new[key]} ({(new[key] - old[key]) / old[key] * 100:+.1f}%)'
+
+    print(f"# compared with {baseline.get('commit')} ({baseline.get('timestamp')})", file=sys.stderr)
+    for name, new in result['scenarios'].items():
+        old = baseline['scenarios'].get(name)
+        if old is None:
+            print(f'{name}: new scenario', file=sys.stderr)
+            continue
+        print(f'{name}: ' + ', '.join(
+            change(key, old, new) for key in ('req_per_sec', 'p95_ms', 'queries_per_request')
+        ), file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=500, help='Timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--url', help='Drive a running server instead of the in-process test client')
+    parser.add_argument('--database', help='SQLite file for in-process runs, generated if missing (default: scratch)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--patients', type=int, default=20000)
+    parser.add_argument('--doctors', type=int, default=500)
+    parser.add_argument('--appointments', type=int, default=100000)
+    parser.add_argument('--username', help='Default: the first user generated for --seed')
+    parser.add_argument('--password', default='synthetic-pass')
+    parser.add_argument('--output', help='Also write the JSON result to this file')
+    parser.add_argument('--compare', help='Earlier JSON result to compare against')
+    args = parser.parse_args()
+    args.username = args.username or f'synthetic-{args.seed}-0'
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.url:
+            transport = HTTPTransport(args.url)
+        else:
+            args.database = args.database or os.path.join(scratch, 'load.sqlite3')
+            setup_database(args)
+            transport = ClientTransport()
+
+        headers = login(transport, args)
+        fixture = {
+            'patient': first_id(transport, headers, '/api/patients/?page_size=1'),
+            'run': time.time_ns() // 10 ** 9,
+        }
+        fixture['doctor'] = care_team_doctor(transport, headers, fixture['patient'])
+
+        result = {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'target': args.url or 'in-process',
+            'concurrency': args.concurrency,
+            'scenarios': {},
+        }
+        for name in args.scenarios:
+            result['scenarios'][name] = run_scenario(transport, headers, name, fixture, args)
+            print(f'{name}: {json.dumps(result["scenarios"][name])}', file=sys.stderr, flush=True)
+        transport.close()
+
+    print(json.dumps(result, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2) + '\n')
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Helpers for the async (ASGI) read endpoints under ``/api/async/``.
+
+These are plain Django async views rather than DRF views, so the request
+never leaves the event loop except for the ORM calls themselves. They reuse
+the DRF serializers and renderer, so response bodies match the sync
+endpoints.
+"""
+import base64
+import binascii
+from functools import wraps
+
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils.dateparse import parse_datetime
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import replace_query_param
+
+from accounts.authentication import CachedJWTAuthentication
+from .pagination import CreatedAtCursorPagination
+
+_renderer = JSONRenderer()
+_authentication = CachedJWTAuthentication()
+
+
+def json_response(data, status=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        _renderer.render(data), status=status, headers=headers, content_type=_renderer.media_type,
+    )
+
+
+def async_api_view(view):
+    """Allow GET only and authenticate the bearer token before calling ``view``."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            detail = exceptions.MethodNotAllowed(request.method).detail
+            return json_response({'detail': detail}, status.HTTP_405_METHOD_NOT_ALLOWED, {'Allow': 'GET, HEAD'})
+
+        headers = {'WWW-Authenticate': _authentication.authenticate_header(request)}
+        try:
+            result = await _authentication.aauthenticate(request)
+        except exceptions.AuthenticationFailed as exc:
+            detail = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+            return json_response(detail, exc.status_code, headers)
+        if result is None:
+            detail = exceptions.NotAuthenticated.default_detail
+            return json_response({'detail': detail}, status.HTTP_401_UNAUTHORIZED, headers)
+
+        request.user, request.auth = result
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def encode_cursor(instance):
+    position = f'{instance.created_at.isoformat()}|{instance.pk}'
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        created_at = None
+    if created_at is None:
+        raise exceptions.NotFound(CreatedAtCursorPagination.invalid_cursor_message)
+    return created_at, pk
+
+
+async def keyset_page(request, queryset):
+    """
+    One page of ``queryset`` newest first, and the URL of the next page.
+
+    Same ordering and page size rules as CreatedAtCursorPagination, but the
+    cursor is the (created_at, id) of the last row, so each page is a single
+    index range scan. Cursors are not interchangeable with the sync endpoints.
+    """
+    paginator = CreatedAtCursorPagination()
+    page_size = paginator.get_page_size(Request(request))
+    cursor = request.GET.get(paginator.cursor_query_param)
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+
+    rows = [row async for row in queryset.order_by(*paginator.ordering)[:page_size + 1]]
+    url = request.build_absolute_uri()
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_url = replace_query_param(url, paginator.cursor_query_param, encode_cursor(rows[-1]))
+    return rows, next_url
+
+
+async def paginated_response(request, queryset, serializer_class):
+    try:
+        rows, next_url = await keyset_page(request, queryset)
+    except exceptions.NotFound as exc:
+        return json_response({'detail': exc.detail}, exc.status_code)
+    return json_response({
+        'next': next_url,
+        'previous': None,
+        'results': serializer_class(rows, many=True, context={'request': request}).data,
+    })
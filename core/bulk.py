@@ -0,0 +1,261 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
+
+from .parsers import NDJSONParser
+
+
+def _is_id(value):
+    # bool is an int subclass; anything else (lists, dicts) is not even hashable
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class PreloadedRelatedField(PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves ids from a dict loaded up front with one
+    ``in_bulk`` query, instead of one ``queryset.get()`` per row.
+    """
+    def __init__(self, *args, preloaded=None, **kwargs):
+        self.preloaded = preloaded or {}
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return self.preloaded[pk]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+class BulkModelMixin:
+    """
+    Adds a ``bulk`` list action to a ModelViewSet.
+
+    ``POST`` creates and ``PATCH`` partially updates (rows must carry ``id``)
+    many rows sent as a JSON array or an NDJSON stream. Rows are validated a
+    chunk at a time with a single serializer; related objects and unique
+    constraints are resolved with one set-based query each per chunk, and each
+    chunk is written with ``bulk_create``/``bulk_update`` in its own
+    transaction. Invalid rows are skipped and reported by index.
+    """
+    bulk_chunk_size = 500
+
+    @action(detail=False, methods=['POST', 'PATCH'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {'error': 'Expected a non-empty JSON array or NDJSON stream of objects.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        partial = request.method == 'PATCH'
+        written, errors = [], []
+        for offset in range(0, len(rows), self.bulk_chunk_size):
+            chunk = rows[offset:offset + self.bulk_chunk_size]
+            chunk_written, chunk_errors = self._bulk_write_chunk(chunk, offset, partial)
+            written.extend(chunk_written)
+            errors.extend(chunk_errors)
+        errors.sort(key=lambda error: error['index'])
+
+        if not written:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_200_OK if partial else status.HTTP_201_CREATED
+        return Response(
+            {'updated' if partial else 'created': written, 'errors': errors},
+            status=response_status
+        )
+
+    # Hooks
+
+    def get_bulk_update_queryset(self):
+        """Rows a bulk PATCH may touch."""
+        return self.get_queryset()
+
+    def get_bulk_save_kwargs(self):
+        """Extra attributes set on every created row, like ``perform_create`` would."""
+        return {}
+
+    def validate_bulk_row(self, attrs, instance=None):
+        """Per-row checks that need no queries; raise ValidationError to reject the row."""
+
+    def perform_bulk_create(self, objs):
+        self.get_queryset().model.objects.bulk_create(objs)
+
+    def perform_bulk_update(self, objs, fields):
+        self.get_queryset().model.objects.bulk_update(objs, fields)
+
+    # Internals
+
+    def _bulk_write_chunk(self, rows, offset, partial):
+        serializer = self._get_bulk_serializer(rows)
+        model = serializer.Meta.model
+        errors = []
+
+        instances = {}
+        if partial:
+            ids = {row['id'] for row in rows if isinstance(row, dict) and _is_id(row.get('id'))}
+            instances = self.get_bulk_update_queryset().in_bulk(ids)
+
+        valid = []
+        for index, row in enumerate(rows, start=offset):
+            instance = None
+            if partial:
+                pk = row.get('id') if isinstance(row, dict) else None
+                if pk is None:
+                    errors.append({'index': index, 'errors': {'id': ['This field is required.']}})
+                    continue
+                if not _is_id(pk):
+                    errors.append({'index': index, 'errors': {'id': ['A valid integer is required.']}})
+                    continue
+                instance = instances.get(pk)
+                if instance is None:
+                    errors.append({'index': index, 'errors': {'id': ['Not found.']}})
+                    continue
+
+            serializer.instance = instance
+            try:
+                attrs = serializer.run_validation(row)
+                self.validate_bulk_row(attrs, instance)
+            except serializers.ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+                continue
+            valid.append((index, attrs, instance))
+
+        valid, conflicts = self._check_unique(model, valid)
+        errors.extend(conflicts)
+        if not valid:
+            return [], errors
+
+        if partial:
+            objs, fields = [], set()
+            now = timezone.now()
+            for _, attrs, instance in valid:
+                for attr, value in attrs.items():
+                    setattr(instance, attr, value)
+                fields.update(attrs)
+                for field in model._meta.concrete_fields:
+                    if getattr(field, 'auto_now', False):
+                        setattr(instance, field.attname, now)
+                        fields.add(field.name)
+                objs.append(instance)
+        else:
+            extra = self.get_bulk_save_kwargs()
+            objs = [model(**attrs, **extra) for _, attrs, _ in valid]
+
+        try:
+            with transaction.atomic():
+                if partial:
+                    if fields:
+                        self.perform_bulk_update(objs, sorted(fields))
+                else:
+                    self.perform_bulk_create(objs)
+        except IntegrityError as exc:
+            # A concurrent write beat this chunk to a unique value; nothing was written.
+            return [], errors + [
+                {'index': index, 'errors': {api_settings.NON_FIELD_ERRORS_KEY: [str(exc)]}}
+                for index, _, _ in valid
+            ]
+
+        return [obj.pk for obj in objs], errors
+
+    def _get_bulk_serializer(self, rows):
+        serializer = self.get_serializer()
+        serializer.partial = self.request.method == 'PATCH'
+
+        # Uniqueness is checked for the whole chunk in _check_unique instead
+        serializer.validators = [
+            validator for validator in serializer.validators
+            if not isinstance(validator, UniqueTogetherValidator)
+        ]
+        for name, field in list(serializer.fields.items()):
+            field.validators = [
+                validator for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+            if isinstance(field, PrimaryKeyRelatedField) and not field.read_only:
+                serializer.fields[name] = self._preload_related_field(field, rows)
+        return serializer
+
+    def _preload_related_field(self, field, rows):
+        pk_field = field.get_queryset().model._meta.pk
+        pks = set()
+        for row in rows:
+            if not isinstance(row, dict) or isinstance(row.get(field.field_name), bool):
+                continue
+            try:
+                pks.add(pk_field.to_python(row.get(field.field_name)))
+            except (TypeError, ValueError, DjangoValidationError):
+                continue
+        pks.discard(None)
+        return PreloadedRelatedField(
+            *field._args, preloaded=field.get_queryset().in_bulk(pks), **field._kwargs
+        )
+
+    def _check_unique(self, model, valid):
+        """Reject rows that collide with existing rows or earlier rows in the request."""
+        checks = [(field.name,) for field in model._meta.local_fields if field.unique and not field.primary_key]
+        checks += [tuple(fields) for fields in model._meta.unique_together]
+
+        conflicts = {}
+        for check in checks:
+            # Updates only need checking when they touch one of the fields
+            rows = [
+                (index, attrs, instance) for index, attrs, instance in valid
+                if instance is None or set(check) & set(attrs)
+            ]
+            if not rows:
+                continue
+            attnames = [model._meta.get_field(name).attname for name in check]
+
+            def key(attrs, instance):
+                values = []
+                for name in check:
+                    value = attrs[name] if name in attrs else getattr(instance, name, None)
+                    values.append(getattr(value, 'pk', value))
+                return tuple(values)
+
+            keys = {index: key(attrs, instance) for index, attrs, instance in rows}
+            lookup = {
+                f'{attname}__in': {values[position] for values in keys.values()}
+                for position, attname in enumerate(attnames)
+            }
+            existing = {
+                tuple(values): pk
+                for pk, *values in model._default_manager.filter(**lookup).values_list('pk', *attnames)
+            }
+
+            if len(check) == 1:
+                error_key = check[0]
+            else:
+                error_key = api_settings.NON_FIELD_ERRORS_KEY
+            message = model().unique_error_message(model, check).messages[0]
+
+            seen = set()
+            for index, attrs, instance in rows:
+                values = keys[index]
+                if None in values:
+                    continue
+                owner = existing.get(values)
+                taken = owner is not None and (instance is None or owner != instance.pk)
+                if taken or values in seen:
+                    conflicts.setdefault(index, {})[error_key] = [message]
+                seen.add(values)
+
+        remaining = [row for row in valid if row[0] not in conflicts]
+        return remaining, [{'index': index, 'errors': errors} for index, errors in conflicts.items()]
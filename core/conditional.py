@@ -0,0 +1,74 @@
+import hashlib
+
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+
+def etag_matches(request, etag):
+    """True when the request's If-None-Match header names ``etag`` (or ``*``)."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or quote_etag(etag) in etags
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = _('The resource has been modified since it was fetched.')
+    default_code = 'precondition_failed'
+
+
+class ConditionalRequestMixin:
+    """
+    ETag / Last-Modified support for detail views of models with ``updated_at``.
+
+    ``retrieve`` answers If-None-Match / If-Modified-Since with 304 straight
+    after the primary key lookup, before any serialization. Write views call
+    ``check_preconditions`` on the instance they already fetched to reject
+    stale If-Match / If-Unmodified-Since requests with 412.
+    """
+
+    def get_etag_parts(self, instance):
+        return [instance._meta.label, instance.pk, instance.updated_at.isoformat()]
+
+    def get_etag(self, instance):
+        source = ':'.join(str(part) for part in self.get_etag_parts(instance))
+        return hashlib.md5(source.encode()).hexdigest()
+
+    def get_last_modified(self, instance):
+        return instance.updated_at
+
+    def get_validator_headers(self, instance):
+        return {
+            'ETag': quote_etag(self.get_etag(instance)),
+            'Last-Modified': http_date(self.get_last_modified(instance).timestamp()),
+        }
+
+    def is_not_modified(self, request, instance):
+        if request.headers.get('If-None-Match'):
+            return etag_matches(request, self.get_etag(instance))
+        since = parse_http_date_safe(request.headers.get('If-Modified-Since'))
+        return since is not None and int(self.get_last_modified(instance).timestamp()) <= since
+
+    def check_preconditions(self, request, instance):
+        header = request.headers.get('If-Match')
+        if header:
+            etags = parse_etags(header)
+            if '*' not in etags and quote_etag(self.get_etag(instance)) not in etags:
+                raise PreconditionFailed()
+            return
+        since = parse_http_date_safe(request.headers.get('If-Unmodified-Since'))
+        if since is not None and int(self.get_last_modified(instance).timestamp()) > since:
+            raise PreconditionFailed()
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        headers = self.get_validator_headers(instance)
+        if self.is_not_modified(request, instance):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers=headers)
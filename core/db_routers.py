@@ -0,0 +1,82 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+# Same as rest_framework.permissions.SAFE_METHODS; the router loads with settings, before DRF is needed
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_request_state = ContextVar('replica_routing_state', default=None)
+
+
+def sticky_key(user_id):
+    return f'db-primary-sticky:{user_id}'
+
+
+class RequestRoutingState:
+    """What the router knows about the request being served on this thread/task."""
+
+    def __init__(self, request):
+        self.request = request
+        # Unsafe requests read their own writes, so they never leave the primary
+        self.pinned = request.method not in SAFE_METHODS
+        self.wrote = False
+        self.replica = None
+
+    def user_id(self):
+        # Only trust a user DRF has already authenticated. Evaluating Django's
+        # lazy session user here would itself issue queries.
+        user = self.request.__dict__.get('user')
+        if user is None or isinstance(user, SimpleLazyObject) or not user.is_authenticated:
+            return None
+        return user.pk
+
+
+def begin_request(request):
+    return _request_state.set(RequestRoutingState(request))
+
+
+def end_request(token):
+    state = _request_state.get()
+    _request_state.reset(token)
+    if state is not None and state.wrote:
+        user_id = state.user_id()
+        if user_id is not None:
+            cache.set(sticky_key(user_id), True, settings.DB_REPLICA_STICKY_SECONDS)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads made while serving an authenticated safe-method request to a
+    replica from settings.REPLICA_DATABASES. Everything else (writes, unsafe
+    requests, management commands, users who wrote within the last
+    DB_REPLICA_STICKY_SECONDS) uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or state.pinned or not settings.REPLICA_DATABASES:
+            return None
+
+        user_id = state.user_id()
+        if user_id is None:
+            return None
+        if state.replica is None:
+            if cache.get(sticky_key(user_id)):
+                state.pinned = True
+                return None
+            state.replica = random.choice(settings.REPLICA_DATABASES)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+            state.pinned = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
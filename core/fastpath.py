@@ -0,0 +1,181 @@
+from datetime import timedelta, timezone as dt_timezone
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .metrics import serializer_timer
+
+# Field types whose to_representation() is the identity for the values the
+# database driver already returns (str, int, bool)
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField, serializers.ChoiceField,
+)
+
+
+class ListPlan:
+    """
+    A ModelSerializer's read-only output, compiled once per serializer class
+    into one database column and one converter per field.
+
+    ``serialize`` turns rows from ``values_list(*plan.columns, named=True)``
+    into the same dicts, in the same key order, as ``serializer.data``.
+    Method fields are called with the row (a named tuple). Columns they read
+    beyond the serializer's own fields are listed in the serializer's
+    ``Meta.fast_path_columns``; without it every concrete column is fetched.
+    Read-only plain fields whose source is neither a model field nor a model
+    attribute are fetched by name, as annotations of the list queryset.
+    """
+
+    def __init__(self, model, fields, columns):
+        self.model = model
+        self.fields = fields  # (name, column index or None, kind)
+        self.columns = columns
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_serializer(cls, serializer_class):
+        """The plan for ``serializer_class``, or None if it needs the full serializer."""
+        if not issubclass(serializer_class, serializers.ModelSerializer):
+            return None
+        model = serializer_class.Meta.model
+        columns, fields = [], []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                fields.append((name, None, 'method'))
+                continue
+            if field.source == '*' or '.' in field.source:
+                return None
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                if not field.read_only or not isinstance(field, PASSTHROUGH_FIELDS) or hasattr(model, field.source):
+                    return None
+                columns.append(field.source)
+                fields.append((name, len(columns) - 1, 'value'))
+                continue
+            if model_field.is_relation:
+                if not (model_field.many_to_one and isinstance(field, PrimaryKeyRelatedField)) or field.pk_field:
+                    return None
+                kind = 'pk'
+            elif isinstance(field, serializers.DateTimeField):
+                kind = 'datetime'
+            elif isinstance(field, serializers.DateField):
+                kind = 'date'
+            elif isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(
+                field, (serializers.FileField, serializers.MultipleChoiceField)
+            ):
+                kind = 'value'
+            else:
+                kind = 'field'
+            columns.append(model_field.attname)
+            fields.append((name, len(columns) - 1, kind))
+
+        if any(kind == 'method' for _, _, kind in fields):
+            extra = getattr(serializer_class.Meta, 'fast_path_columns', None)
+            if extra is None:
+                extra = [field.attname for field in model._meta.concrete_fields]
+            columns.extend(name for name in extra if name not in columns)
+        return cls(model, tuple(fields), tuple(columns))
+
+    def bind(self, serializer):
+        """Resolve converters against a serializer instance (its context, timezone and methods)."""
+        converters = []
+        for name, index, kind in self.fields:
+            field = serializer.fields[name]
+            if kind == 'method':
+                converters.append((name, None, getattr(serializer, field.method_name)))
+            elif kind in ('value', 'pk'):
+                converters.append((name, index, None))
+            elif kind == 'datetime' and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601:
+                converters.append((name, index, _datetime_converter(field)))
+            elif kind == 'date' and getattr(field, 'format', api_settings.DATE_FORMAT) == ISO_8601:
+                converters.append((name, index, _isoformat))
+            else:
+                converters.append((name, index, field.to_representation))
+        return converters
+
+    def serialize(self, rows, serializer):
+        converters = self.bind(serializer)
+        data = []
+        for row in rows:
+            item = {}
+            for name, index, convert in converters:
+                if index is None:
+                    item[name] = convert(row)
+                    continue
+                value = row[index]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+
+ZERO = timedelta(0)
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _datetime_converter(field):
+    # Same as DateTimeField.to_representation with the ISO format, with the
+    # target timezone looked up once per request instead of once per value
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    utc = tz is dt_timezone.utc or getattr(tz, 'key', None) == 'UTC'
+
+    def convert(value):
+        if not utc or value.utcoffset() != ZERO:
+            value = field.enforce_timezone(value)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+class FastListMixin:
+    """
+    Read-only fast path for the list action.
+
+    Rows are fetched with ``values_list()`` and rendered through the list
+    serializer's compiled ListPlan instead of building a model instance and
+    a field tree per row. Serializers the plan cannot express fall back to
+    the normal path. Responses produced here are flagged to FastJSONRenderer,
+    which may hand them to orjson.
+    """
+    fast_path = False
+
+    def list(self, request, *args, **kwargs):
+        plan = ListPlan.for_serializer(self.get_serializer_class())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # The cursor pagination reads its ordering columns off each row, and
+        # an ordering filter on the view may have replaced the default ones
+        columns = list(plan.columns)
+        ordering = ()
+        if hasattr(self.paginator, 'get_ordering'):
+            ordering = self.paginator.get_ordering(request, queryset, self)
+        for name in ordering:
+            name = name.lstrip('-')
+            if name not in columns:
+                columns.append(name)
+        queryset = queryset.values_list(*columns, named=True)
+        page = self.paginate_queryset(queryset)
+        with serializer_timer():
+            data = plan.serialize(page if page is not None else queryset, self.get_serializer())
+        self.fast_path = True
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def get_renderer_context(self):
+        context = super().get_renderer_context()
+        context['fast_path'] = self.fast_path
+        return context
@@ -0,0 +1,105 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+# Cached while the first request holding a key is still running
+IN_PROGRESS = 'in-progress'
+
+
+def idempotency_cache_key(user_id, key):
+    # Keys are client supplied, so hash them to a fixed length for the cache backend
+    return f'idempotency:{user_id}:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def request_fingerprint(request):
+    """Digest of what the key was first used for: method, path and raw body."""
+    digest = hashlib.sha256()
+    for part in (request.method, request.get_full_path()):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+class IdempotentCreateMixin:
+    """
+    Makes ``create`` safe to retry with an ``Idempotency-Key`` header.
+
+    The first request with a key claims it with an atomic ``cache.add``, runs
+    normally and, if it succeeds, its status, body and headers are cached for
+    ``IDEMPOTENCY_KEY_TIMEOUT`` seconds under the user and key. Retries are
+    answered from that entry with ``Idempotent-Replayed: true`` and never reach
+    the serializer or the database. A retry that arrives while the first
+    request is still running gets 409; reusing a key for a different request
+    gets 422. Failed requests release the key so the client can correct and
+    resend.
+
+    Keys live in the default cache, which must be shared by every worker and
+    add atomically. Settings refuse any other backend when DEBUG is off.
+    """
+    idempotency_lock_timeout = 60
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return super().create(request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f'{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cache_key = idempotency_cache_key(request.user.id, key)
+        fingerprint = request_fingerprint(request)
+        if cache.add(cache_key, (fingerprint, IN_PROGRESS), self.idempotency_lock_timeout):
+            return self._create_once(cache_key, fingerprint, request, *args, **kwargs)
+
+        stored = cache.get(cache_key)
+        if stored is None:
+            # The first request failed or its lock expired in between; take the key over
+            if not cache.add(cache_key, (fingerprint, IN_PROGRESS), self.idempotency_lock_timeout):
+                return self._in_progress()
+            return self._create_once(cache_key, fingerprint, request, *args, **kwargs)
+
+        stored_fingerprint, result = stored
+        if stored_fingerprint != fingerprint:
+            return Response(
+                {'error': f'This {IDEMPOTENCY_HEADER} was already used for a different request.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        if result == IN_PROGRESS:
+            return self._in_progress()
+        response_status, data, headers = result
+        return Response(data, status=response_status, headers={**headers, REPLAYED_HEADER: 'true'})
+
+    def _create_once(self, cache_key, fingerprint, request, *args, **kwargs):
+        try:
+            response = super().create(request, *args, **kwargs)
+        except BaseException:
+            cache.delete(cache_key)
+            raise
+        if not status.is_success(response.status_code):
+            cache.delete(cache_key)
+            return response
+
+        headers = {name: value for name, value in response.items() if name.lower() != 'content-type'}
+        cache.set(
+            cache_key,
+            (fingerprint, (response.status_code, response.data, headers)),
+            settings.IDEMPOTENCY_KEY_TIMEOUT,
+        )
+        return response
+
+    def _in_progress(self):
+        return Response(
+            {'error': f'A request with this {IDEMPOTENCY_HEADER} is still being processed.'},
+            status=status.HTTP_409_CONFLICT,
+            headers={'Retry-After': '1'}
+        )
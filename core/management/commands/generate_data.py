@@ -0,0 +1,216 @@
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from appointments.models import Appointment
+from doctors.models import Doctor
+from mappings.models import PatientDoctorMapping
+from patients.models import Patient
+
+FIRST_NAMES = (
+    'Ada', 'Alan', 'Amara', 'Ana', 'Arjun', 'Ben', 'Chen', 'Chloe', 'Dana', 'David', 'Elena', 'Emeka',
+    'Fatima', 'Grace', 'Hana', 'Ivan', 'James', 'Jin', 'Kofi', 'Lena', 'Liam', 'Maria', 'Mateo', 'Mei',
+    'Noah', 'Nora', 'Omar', 'Priya', 'Rosa', 'Sam', 'Sofia', 'Tariq', 'Uma', 'Yusuf', 'Zoe',
+)
+LAST_NAMES = (
+    'Adeyemi', 'Brown', 'Chen', 'Costa', 'Dubois', 'Garcia', 'Haddad', 'Ivanova', 'Jensen', 'Kim',
+    'Kowalski', 'Lee', 'Martin', 'Mensah', 'Murphy', 'Nakamura', 'Novak', 'Okafor', 'Patel', 'Rossi',
+    'Schmidt', 'Silva', 'Singh', 'Smith', 'Tanaka', 'Nguyen', 'Walker', 'Yilmaz',
+)
+HOSPITALS = (
+    'General Hospital', 'St. Mary Medical Center', 'Riverside Clinic', 'City Heart Institute',
+    'Northside Children\'s Hospital', 'Lakeview Health', 'University Medical Center',
+)
+REASONS = (
+    'Routine check-up', 'Follow-up visit', 'Blood test results', 'Persistent headache',
+    'Prescription renewal', 'Chest pain', 'Back pain', 'Vaccination', 'Skin rash', 'Annual physical',
+)
+SPECIALIZATIONS = [code for code, _ in Doctor.SPECIALIZATION_CHOICES]
+GENDERS = [code for code, _ in Patient.GENDER_CHOICES]
+DURATIONS = (15, 30, 30, 30, 45, 60)
+
+# Appointments are booked on the quarter hour within working hours (UTC)
+SLOT_MINUTES = 15
+DAY_START_HOUR, DAY_END_HOUR = 8, 18
+# Even the longest bookings fit this many times into one working day
+BOOKINGS_PER_DAY = (DAY_END_HOUR - DAY_START_HOUR) * 60 // max(DURATIONS)
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-generate synthetic users, patients, doctors, mappings and appointments '
+        'for load testing. Output is reproducible for a given --seed and day.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--patients', type=int, default=10000)
+        parser.add_argument('--doctors', type=int, default=500)
+        parser.add_argument(
+            '--mappings-per-patient', type=int, default=2,
+            help='Doctors assigned to each patient; about 10%% of assignments are inactive (default: 2).',
+        )
+        parser.add_argument('--appointments', type=int, default=50000)
+        parser.add_argument('--days-back', type=int, default=90, help='Days of appointment history (default: 90).')
+        parser.add_argument('--days-ahead', type=int, default=30, help='Days of future bookings (default: 30).')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT (default: 5000).')
+        parser.add_argument(
+            '--password', default='synthetic-pass',
+            help='Password of every generated user, hashed once (default: synthetic-pass).',
+        )
+
+    def handle(self, *args, seed, batch_size, **options):
+        if options['mappings_per_patient'] > options['doctors']:
+            raise CommandError('--mappings-per-patient cannot exceed --doctors.')
+        days = options['days_back'] + options['days_ahead']
+        if options['appointments'] > options['doctors'] * days * BOOKINGS_PER_DAY:
+            raise CommandError(
+                f'--appointments cannot exceed {BOOKINGS_PER_DAY} per doctor and day of '
+                '--days-back plus --days-ahead.'
+            )
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.batch_size = batch_size
+        self.today = date.today()
+        if User.objects.filter(username__startswith=f'synthetic-{seed}-').exists():
+            raise CommandError(f'Synthetic data for seed {seed} already exists; use another --seed.')
+
+        users = self.insert(User, self.users(options['users'], options['password']))
+        patients = self.insert(Patient, self.patients(options['patients'], users))
+        doctors = self.insert(Doctor, self.doctors(options['doctors'], users))
+        # Each doctor's actively assigned patients; appointments are booked among them
+        care_teams = {doctor_id: [] for doctor_id, _ in doctors}
+        self.insert(PatientDoctorMapping, self.mappings(patients, doctors, options['mappings_per_patient'], care_teams))
+        self.insert(Appointment, self.appointments(
+            options['appointments'], patients, doctors, care_teams, options['days_back'], options['days_ahead'],
+        ))
+
+        call_command('rebuild_counters', stdout=self.stdout, verbosity=options['verbosity'])
+
+    def insert(self, model, objects):
+        """bulk_create ``objects`` in batches, one transaction each; return [(pk, owner id)]."""
+        started = time.perf_counter()
+        rows, batch = [], []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                rows.extend(self.insert_batch(model, batch))
+                batch = []
+        if batch:
+            rows.extend(self.insert_batch(model, batch))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {len(rows)} rows in {elapsed:.1f}s '
+            f'({len(rows) / elapsed if elapsed else 0:.0f} rows/s)'
+        )
+        return rows
+
+    def insert_batch(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+        return [(obj.pk, getattr(obj, 'user_id', None)) for obj in batch]
+
+    def name(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def users(self, count, password):
+        password = make_password(password)
+        for i in range(count):
+            first_name, last_name = self.name()
+            yield User(
+                username=f'synthetic-{self.seed}-{i}', password=password,
+                first_name=first_name, last_name=last_name,
+                email=f'synthetic-{self.seed}-{i}@example.com',
+            )
+
+    def patients(self, count, users):
+        for i in range(count):
+            first_name, last_name = self.name()
+            age = self.rng.triangular(0, 95, 40)
+            yield Patient(
+                user_id=self.rng.choice(users)[0],
+                first_name=first_name, last_name=last_name,
+                date_of_birth=self.today - timedelta(days=int(age * 365.25)),
+                gender=self.rng.choice(GENDERS),
+                contact_number=f'555{self.rng.randrange(10 ** 7):07d}',
+                email=f'{first_name}.{last_name}.{i}@example.com'.lower(),
+            )
+
+    def doctors(self, count, users):
+        for i in range(count):
+            first_name, last_name = self.name()
+            yield Doctor(
+                user_id=self.rng.choice(users)[0],
+                first_name=first_name, last_name=last_name,
+                specialization=self.rng.choice(SPECIALIZATIONS),
+                contact_number=f'555{self.rng.randrange(10 ** 7):07d}',
+                email=f'dr.{last_name}.{i}@example.com'.lower(),
+                license_number=f'SYN{self.seed}-{i:07d}',
+                hospital=self.rng.choice(HOSPITALS),
+                experience_years=self.rng.randrange(1, 40),
+            )
+
+    def mappings(self, patients, doctors, per_patient, care_teams):
+        doctor_ids = [doctor_id for doctor_id, _ in doctors]
+        for patient_id, owner_id in patients:
+            for doctor_id in self.rng.sample(doctor_ids, per_patient):
+                is_active = self.rng.random() >= 0.1
+                if is_active:
+                    care_teams[doctor_id].append(patient_id)
+                yield PatientDoctorMapping(
+                    patient_id=patient_id, doctor_id=doctor_id, assigned_by_id=owner_id,
+                    is_active=is_active, reason_for_assignment=self.rng.choice(REASONS),
+                )
+
+    def appointments(self, count, patients, doctors, care_teams, days_back, days_ahead):
+        """
+        Each doctor's bookings are spread at random over the working days of
+        the past/future window, at most BOOKINGS_PER_DAY a day. Past ones
+        are completed or cancelled, future ones mostly scheduled.
+        """
+        now = datetime.now(timezone.utc)
+        first_day = datetime.combine(self.today - timedelta(days=days_back), datetime.min.time(), timezone.utc)
+        days = days_back + days_ahead
+        per_doctor, remainder = divmod(count, len(doctors))
+        for index, (doctor_id, owner_id) in enumerate(doctors):
+            team = care_teams[doctor_id] or [self.rng.choice(patients)[0]]
+            booked = [0] * days
+            for _ in range(per_doctor + (index < remainder)):
+                day = self.rng.randrange(days)
+                while booked[day] >= BOOKINGS_PER_DAY:
+                    day = self.rng.randrange(days)
+                booked[day] += 1
+            for day, bookings in enumerate(booked):
+                for start, duration in self.working_day(first_day + timedelta(days=day), bookings):
+                    if start < now:
+                        status = 'CANCELLED' if self.rng.random() < 0.15 else 'COMPLETED'
+                    else:
+                        status = 'CANCELLED' if self.rng.random() < 0.1 else 'SCHEDULED'
+                    yield Appointment(
+                        doctor_id=doctor_id, patient_id=self.rng.choice(team), created_by_id=owner_id,
+                        appointment_datetime=start, duration_minutes=duration,
+                        end_datetime=start + timedelta(minutes=duration),
+                        status=status, reason=self.rng.choice(REASONS),
+                    )
+
+    def working_day(self, day, bookings):
+        """
+        (start, duration) of ``bookings`` consecutive, non-overlapping
+        appointments on ``day``. Each starts at a working-minute offset on the
+        quarter hour, and the last one ends by DAY_END_HOUR.
+        """
+        durations = [self.rng.choice(DURATIONS) for _ in range(bookings)]
+        free_slots = ((DAY_END_HOUR - DAY_START_HOUR) * 60 - sum(durations)) // SLOT_MINUTES
+        # Free time before each booking: the gaps between sorted cut points
+        cuts = sorted(self.rng.randint(0, free_slots) for _ in range(bookings))
+        offset = 0
+        for cut, duration in zip(cuts, durations):
+            yield day + timedelta(hours=DAY_START_HOUR, minutes=offset + cut * SLOT_MINUTES), duration
+            offset += duration
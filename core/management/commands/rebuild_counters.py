@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from appointments.counters import refresh_upcoming_appointment_counts
+from doctors.models import Doctor
+from mappings.counters import refresh_active_patient_counts
+from patients.models import Patient
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute Doctor.active_patient_count and Patient.upcoming_appointment_count '
+        'from the mapping and appointment tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Primary key range updated per statement (default: 10000).',
+        )
+
+    def handle(self, *args, batch_size, **options):
+        doctors = self.rebuild(Doctor, refresh_active_patient_counts, batch_size)
+        patients = self.rebuild(Patient, refresh_upcoming_appointment_counts, batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt counters for {doctors} doctors and {patients} patients.'
+        ))
+
+    def rebuild(self, model, refresh, batch_size):
+        # One correlated UPDATE per primary key range keeps each transaction short
+        last = model.objects.aggregate(last=Max('pk'))['last'] or 0
+        updated = 0
+        for start in range(0, last, batch_size):
+            with transaction.atomic():
+                updated += refresh(model.objects.filter(pk__gt=start, pk__lte=start + batch_size).values('pk'))
+        return updated
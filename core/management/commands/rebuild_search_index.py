@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from doctors.search import doctor_search
+from patients.search import patient_search
+
+
+class Command(BaseCommand):
+    help = (
+        'Drop and recreate the patient and doctor search indexes. On SQLite a migration '
+        'that remakes either table (e.g. most AlterFields) silently drops the sync '
+        'triggers; migrate reinstalls missing ones itself, this forces a full rebuild.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, database, **options):
+        with connections[database].schema_editor() as schema_editor:
+            for index in (patient_search, doctor_search):
+                index.uninstall(schema_editor)
+                index.install(schema_editor)
+                self.stdout.write(f'Rebuilt search index for {index.table}.')
@@ -0,0 +1,80 @@
+import json
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Rank the statements in the slow-query log (SLOW_QUERY_LOG) by total time, '
+        'with their call sites and EXPLAIN plan.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=settings.SLOW_QUERY_LOG, help='Log file (default: SLOW_QUERY_LOG).')
+        parser.add_argument('--limit', type=int, default=10, help='Fingerprints to list (default: 10).')
+        parser.add_argument('--since', help='Only entries at or after this ISO 8601 timestamp.')
+        parser.add_argument('--json', action='store_true', dest='as_json', help='Print one JSON object per fingerprint.')
+
+    def handle(self, *args, path, limit, since, as_json, **options):
+        groups = self.rollup(path, since)
+        ranked = sorted(groups.values(), key=lambda group: -group['total_ms'])[:limit]
+        for group in ranked:
+            group['mean_ms'] = round(group['total_ms'] / group['count'], 3)
+            group['total_ms'] = round(group['total_ms'], 3)
+            group['routes'] = [route for route, _ in group['routes'].most_common(3)]
+            # The call site that spent the most time in this statement
+            stack = max(group['stacks'].items(), key=lambda item: item[1])[0]
+            group['stack'] = stack.split('\n') if stack else []
+            del group['stacks']
+        if as_json:
+            for group in ranked:
+                self.stdout.write(json.dumps(group))
+            return
+        if not ranked:
+            self.stdout.write('No slow queries logged.')
+            return
+        for rank, group in enumerate(ranked, 1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"#{rank} {group['fingerprint']}  total {group['total_ms']:.1f} ms  "
+                f"count {group['count']}  mean {group['mean_ms']:.1f} ms  max {group['max_ms']:.1f} ms"
+            ))
+            self.stdout.write(f"  {group['sql']}")
+            for route in group['routes']:
+                self.stdout.write(f'  route: {route}')
+            for frame in group['stack']:
+                self.stdout.write(f'  at {frame}')
+            for line in group['plan'] or ():
+                self.stdout.write(f'  plan: {line}')
+
+    def rollup(self, path, since):
+        groups = {}
+        try:
+            log = open(path, encoding='utf-8')
+        except FileNotFoundError:
+            raise CommandError(f'No slow-query log at {path}. Set SLOW_QUERY_MS to start one.')
+        with log:
+            for line in log:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if since and entry['ts'] < since:
+                    continue
+                group = groups.get(entry['fingerprint'])
+                if group is None:
+                    group = groups[entry['fingerprint']] = {
+                        'fingerprint': entry['fingerprint'], 'sql': entry['sql'], 'count': 0,
+                        'total_ms': 0.0, 'max_ms': 0.0, 'plan': None,
+                        'routes': Counter(), 'stacks': defaultdict(int),
+                    }
+                group['count'] += 1
+                group['total_ms'] += entry['duration_ms']
+                group['max_ms'] = max(group['max_ms'], entry['duration_ms'])
+                group['plan'] = entry['plan'] or group['plan']
+                if entry['route']:
+                    group['routes'][entry['route']] += 1
+                group['stacks']['\n'.join(entry['stack'])] += entry['duration_ms']
+        return groups
+
@@ -0,0 +1,220 @@
+"""
+Per-request instrumentation: SQL query count and time, serializer time, view
+time and total time, reported in a ``Server-Timing`` header and aggregated
+per route into in-memory histograms.
+
+Enabled by ``REQUEST_METRICS``. When it is off RequestMetricsMiddleware
+removes itself from the stack and the serializers are never wrapped, so the
+only remaining cost is the ``serializer_timer()`` context variable lookup in
+the list fast path. Histograms are per process.
+"""
+import bisect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+_request_state = ContextVar('request_metrics_state', default=None)
+
+# Histogram bucket upper bounds. Milliseconds: 0.1 up to ~100000, each 10%
+# above the last, so a reported percentile is within 10% of the true value.
+# Query counts are exact up to 1000.
+MS_BUCKETS = tuple(0.1 * 1.1 ** i for i in range(146))
+COUNT_BUCKETS = tuple(range(1001))
+PERCENTILES = (50, 95, 99)
+
+
+class RequestMetrics:
+    """What has been measured so far for the request served on this thread/task."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.view_started = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+        self.finished = None
+
+    def finish(self):
+        self.finished = perf_counter()
+
+    @property
+    def total_time(self):
+        return self.finished - self.started
+
+    @property
+    def view_time(self):
+        # From just before the view is called until the response is back here
+        if self.view_started is None:
+            return None
+        return self.finished - self.view_started
+
+    def server_timing(self):
+        entries = [
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serializer_time * 1000:.2f}',
+        ]
+        if self.view_time is not None:
+            entries.append(f'view;dur={self.view_time * 1000:.2f}')
+        entries.append(f'total;dur={self.total_time * 1000:.2f}')
+        return ', '.join(entries)
+
+    def record_query(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - started
+            self.queries += 1
+
+
+def begin_request():
+    return _request_state.set(RequestMetrics())
+
+
+def current_request():
+    return _request_state.get()
+
+
+def end_request(token):
+    state = _request_state.get()
+    _request_state.reset(token)
+    return state
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper adding the query to the current request's metrics, if one is measured."""
+    state = _request_state.get()
+    if state is None:
+        return execute(sql, params, many, context)
+    return state.record_query(execute, sql, params, many, context)
+
+
+@contextmanager
+def serializer_timer():
+    """Add the time spent in the block to the current request's serializer time."""
+    state = _request_state.get()
+    if state is None or state.serializing:
+        # Not measuring, or nested inside a serializer already being timed
+        yield
+        return
+    state.serializing = True
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        state.serializer_time += perf_counter() - started
+        state.serializing = False
+
+
+def _timed(data_property):
+    def data(self):
+        with serializer_timer():
+            return data_property.fget(self)
+    return property(data, doc=data_property.__doc__)
+
+
+_instrument_lock = threading.Lock()
+_instrumented = False
+
+
+def instrument_serializers():
+    """Time ``.data`` of every DRF serializer. Idempotent."""
+    global _instrumented
+    from rest_framework import serializers
+
+    with _instrument_lock:
+        if _instrumented:
+            return
+        for cls in (serializers.Serializer, serializers.ListSerializer):
+            cls.data = _timed(cls.__dict__['data'])
+        _instrumented = True
+
+
+class Histogram:
+    def __init__(self, buckets=MS_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        rank = self.total * p / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return 0.0
+
+    def summary(self):
+        summary = {f'p{p}': round(self.percentile(p), 2) for p in PERCENTILES}
+        summary['mean'] = round(self.sum / self.total, 2) if self.total else 0.0
+        summary['max'] = round(self.max, 2)
+        return summary
+
+
+class RouteMetrics:
+    """Histograms of one route's total time, SQL time, serializer time and query count."""
+
+    def __init__(self):
+        self.total_ms = Histogram()
+        self.db_ms = Histogram()
+        self.serializer_ms = Histogram()
+        self.queries = Histogram(COUNT_BUCKETS)
+
+    def add(self, state):
+        self.total_ms.add(state.total_time * 1000)
+        self.db_ms.add(state.db_time * 1000)
+        self.serializer_ms.add(state.serializer_time * 1000)
+        self.queries.add(state.queries)
+
+    def summary(self):
+        return {
+            'requests': self.total_ms.total,
+            'total_ms': self.total_ms.summary(),
+            'db_ms': self.db_ms.summary(),
+            'serializer_ms': self.serializer_ms.summary(),
+            'queries': self.queries.summary(),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, state):
+        with self._lock:
+            metrics = self._routes.get(route)
+            if metrics is None:
+                metrics = self._routes[route] = RouteMetrics()
+            metrics.add(state)
+
+    def snapshot(self):
+        with self._lock:
+            return {route: metrics.summary() for route, metrics in sorted(self._routes.items())}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+registry = MetricsRegistry()
+
+
+def route_name(request):
+    """``METHOD view-name`` of the resolved route, e.g. ``GET patient-list``."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    return f'{request.method} {match.view_name}'
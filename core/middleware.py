@@ -0,0 +1,146 @@
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import db_routers, metrics, slow_queries
+
+
+def install_execute_wrapper(wrapper):
+    """
+    Add ``wrapper`` once to every connection of the calling thread. The
+    wrappers stay installed and only act while a request's state is set in a
+    context variable, which also reaches the threads async views run their
+    ORM calls in.
+    """
+    for alias in connections:
+        wrappers = connections[alias].execute_wrappers
+        if wrapper not in wrappers:
+            # Outermost, and clear of the push/pop of execute_wrapper() blocks
+            wrappers.insert(0, wrapper)
+
+
+class AsyncCapableMiddleware:
+    """
+    Base for middleware that runs natively in both modes, like Django's own
+    MiddlewareMixin. Under ASGI a sync-only middleware would switch the
+    whole chain to sync mode and run the async views in ``async_to_sync``.
+    Subclasses implement ``__call__`` for WSGI and ``__acall__`` for ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """Exposes the current request to PrimaryReplicaRouter."""
+
+    def __init__(self, get_response):
+        if not settings.REPLICA_DATABASES:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = db_routers.begin_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            db_routers.end_request(token)
+
+    async def __acall__(self, request):
+        token = db_routers.begin_request(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            db_routers.end_request(token)
+
+
+class RequestMetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Times each request (see core.metrics): SQL queries on every
+    connection, serializer and view time go into a ``Server-Timing`` header
+    and the per-route histograms. Listed first so ``total`` covers the other
+    middleware too. Under ASGI, installing the query wrapper costs one hop to
+    the request's sync thread.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS:
+            raise MiddlewareNotUsed
+        metrics.instrument_serializers()
+        super().__init__(get_response)
+        if self.is_async:
+            # A sync process_view would be run through sync_to_async
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = metrics.begin_request()
+        state = metrics.current_request()
+        try:
+            install_execute_wrapper(metrics.record_query)
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        token = metrics.begin_request()
+        state = metrics.current_request()
+        try:
+            await sync_to_async(install_execute_wrapper)(metrics.record_query)
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, state)
+
+    def finish(self, request, response, state):
+        state.finish()
+        response['Server-Timing'] = state.server_timing()
+        route = metrics.route_name(request)
+        if route is not None:
+            metrics.registry.record(route, state)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics.current_request().view_started = perf_counter()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        metrics.current_request().view_started = perf_counter()
+
+
+class SlowQueryLogMiddleware(AsyncCapableMiddleware):
+    """Logs statements slower than SLOW_QUERY_MS run while serving a request (see core.slow_queries)."""
+
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_MS is None:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = slow_queries.begin_request(settings.SLOW_QUERY_MS, request)
+        try:
+            install_execute_wrapper(slow_queries.log_slow_queries)
+            return self.get_response(request)
+        finally:
+            slow_queries.end_request(token)
+
+    async def __acall__(self, request):
+        token = slow_queries.begin_request(settings.SLOW_QUERY_MS, request)
+        try:
+            await sync_to_async(install_execute_wrapper)(slow_queries.log_slow_queries)
+            return await self.get_response(request)
+        finally:
+            slow_queries.end_request(token)
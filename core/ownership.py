@@ -0,0 +1,22 @@
+class OwnerScopedMixin:
+    """
+    Restricts writes to rows the requesting user owns.
+
+    For the methods in ``owner_scoped_methods`` the ``owner_field = user id``
+    predicate is added to the queryset ``get_object()`` fetches from, so a
+    row owned by someone else is a plain 404, and ownership costs nothing
+    beyond that one fetch. The comparison is on the id column, so the owner
+    ``User`` is never loaded. Views whose ``get_queryset`` already applies
+    ``owned()`` for every method set ``owner_scoped_methods = ()``.
+    """
+    owner_field = 'user_id'
+    owner_scoped_methods = ('PUT', 'PATCH', 'DELETE')
+
+    def owned(self, queryset):
+        return queryset.filter(**{self.owner_field: self.request.user.id})
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method in self.owner_scoped_methods:
+            queryset = self.owned(queryset)
+        return queryset
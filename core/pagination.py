@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the newest-first ordering used by every model.
+
+    Cursors are opaque and encode the last seen ``created_at`` value, so each
+    page is a single bounded index range scan no matter how deep the client
+    scrolls. ``id`` breaks ties between rows created in the same instant.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,99 @@
+import csv
+import json
+from datetime import date, datetime
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def format_value(value):
+    """Format a database value the way DRF's serializer fields render it."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    """Pseudo-buffer that hands back what csv.writer writes to it."""
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def stream(self, fields, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow(['' if value is None else format_value(value) for value in row])
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Used for error responses; exports are streamed via stream()
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            data = [data]
+        fields = list(data[0]) if data else []
+        rows = ([item.get(field) for field in fields] for item in data)
+        return ''.join(self.stream(fields, rows)).encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def stream(self, fields, rows):
+        for row in rows:
+            item = {field: format_value(value) for field, value in zip(fields, row)}
+            yield json.dumps(item, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            data = [data]
+        return ''.join(
+            json.dumps(item, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')) + '\n'
+            for item in data
+        ).encode(self.charset)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that hands fast-path list pages (see core.fastpath) to
+    orjson when it is installed.
+
+    Those pages only hold str, int, bool and None, for which orjson writes the
+    same bytes as DRF's compact, non-ASCII, strict settings once U+2028/U+2029
+    are escaped the way JSONRenderer escapes them. Every other response, and
+    any configuration orjson cannot match (indent, ASCII, non-compact), goes
+    through the standard encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or not (renderer_context or {}).get('fast_path')
+            or not (self.compact and self.strict and not self.ensure_ascii)
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
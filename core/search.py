@@ -0,0 +1,232 @@
+import re
+import sys
+
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.sql.constants import INNER
+from django.db.models.sql.datastructures import Join
+from rest_framework.response import Response
+
+TERM_RE = re.compile(r'\w+')
+
+
+class MatchJoin(Join):
+    """
+    ``INNER JOIN <fts> ON <fts>.rowid = <table>.<pk> AND <fts> MATCH %s``:
+    the FTS5 table is searched once and its ``rank`` column is then read
+    from the joined rows.
+    """
+
+    def __init__(self, table_name, parent_alias, table_alias, pk, match):
+        self.table_name = table_name
+        self.parent_alias = parent_alias
+        self.table_alias = table_alias
+        self.join_type = INNER
+        self.join_field = None
+        self.nullable = False
+        self.filtered_relation = None
+        self.pk = pk
+        self.match = match
+
+    def as_sql(self, compiler, connection):
+        qn = compiler.quote_name_unless_alias
+        alias = qn(self.table_alias)
+        alias_str = '' if self.table_alias == self.table_name else f' {alias}'
+        return (
+            f'{self.join_type} {qn(self.table_name)}{alias_str} ON ({alias}.rowid = '
+            f'{qn(self.parent_alias)}.{connection.ops.quote_name(self.pk)} '
+            f'AND {alias}.{connection.ops.quote_name(self.table_name)} MATCH %s)',
+            [self.match],
+        )
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(
+            self.table_name,
+            change_map.get(self.parent_alias, self.parent_alias),
+            change_map.get(self.table_alias, self.table_alias),
+            self.pk,
+            self.match,
+        )
+
+    @property
+    def identity(self):
+        return self.__class__, self.table_name, self.parent_alias, self.pk, self.match
+
+
+class SearchIndex:
+    """
+    Full-text index over a few text columns of one table.
+
+    * SQLite: an external-content FTS5 table ``<table>_fts`` with prefix
+      indexes, kept in sync by INSERT/UPDATE/DELETE triggers. Ranked by bm25.
+    * PostgreSQL: a GIN index on a ``to_tsvector('simple', ...)`` expression
+      over the columns. Ranked by ``ts_rank``.
+    * Anything else: case-insensitive ``icontains`` per term, unranked.
+
+    Every query term is matched as a prefix and all terms must match, so
+    ``?q=ada lov`` finds "Ada Lovelace". The index is created by a RunPython
+    migration calling ``install``.
+
+    On SQLite, a later migration that remakes the table (most ``AlterField``
+    operations do) silently drops the sync triggers, and the index then stops
+    following writes. ``repair_after_migrate`` is connected to
+    ``post_migrate`` by the owning app, so it reinstalls them and reindexes
+    after any migration that lost them. ``manage.py rebuild_search_index``
+    does the same by hand.
+    """
+
+    def __init__(self, table, columns, pk='id'):
+        self.table = table
+        self.columns = tuple(columns)
+        self.pk = pk
+
+    @property
+    def fts_table(self):
+        return f'{self.table}_fts'
+
+    @property
+    def index_name(self):
+        return f'{self.table}_search'
+
+    @property
+    def trigger_names(self):
+        return [self.fts_table + suffix for suffix in ('_ai', '_ad', '_au')]
+
+    def _vector(self, connection):
+        quote = connection.ops.quote_name
+        text = " || ' ' || ".join(f"coalesce({quote(column)}, '')" for column in self.columns)
+        return f"to_tsvector('simple', {text})"
+
+    def install_sql(self, connection):
+        quote = connection.ops.quote_name
+        if connection.vendor == 'sqlite':
+            table, fts, pk = quote(self.table), quote(self.fts_table), quote(self.pk)
+            columns = ', '.join(quote(column) for column in self.columns)
+            new = ', '.join(f'new.{quote(column)}' for column in self.columns)
+            old = ', '.join(f'old.{quote(column)}' for column in self.columns)
+            return [
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, "
+                f"content={table}, content_rowid={pk}, prefix='2 3')",
+                f"CREATE TRIGGER IF NOT EXISTS {quote(self.fts_table + '_ai')} AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.{pk}, {new}); END",
+                f"CREATE TRIGGER IF NOT EXISTS {quote(self.fts_table + '_ad')} AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.{pk}, {old}); END",
+                f"CREATE TRIGGER IF NOT EXISTS {quote(self.fts_table + '_au')} AFTER UPDATE OF {columns} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.{pk}, {old}); "
+                f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.{pk}, {new}); END",
+                # Index the rows that already exist
+                f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+            ]
+        if connection.vendor == 'postgresql':
+            return [
+                f'CREATE INDEX IF NOT EXISTS {quote(self.index_name)} ON {quote(self.table)} '
+                f'USING gin (({self._vector(connection)}))',
+            ]
+        return []
+
+    def uninstall_sql(self, connection):
+        quote = connection.ops.quote_name
+        if connection.vendor == 'sqlite':
+            return [
+                *(f'DROP TRIGGER IF EXISTS {quote(name)}' for name in self.trigger_names),
+                f'DROP TABLE IF EXISTS {quote(self.fts_table)}',
+            ]
+        if connection.vendor == 'postgresql':
+            return [f'DROP INDEX IF EXISTS {quote(self.index_name)}']
+        return []
+
+    def install(self, schema_editor):
+        for sql in self.install_sql(schema_editor.connection):
+            schema_editor.execute(sql, params=None)
+
+    def uninstall(self, schema_editor):
+        for sql in self.uninstall_sql(schema_editor.connection):
+            schema_editor.execute(sql, params=None)
+
+    def missing_triggers(self, connection):
+        """SQLite sync triggers that are gone although the FTS table is installed."""
+        if connection.vendor != 'sqlite':
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)',
+                [self.fts_table, *self.trigger_names],
+            )
+            present = {name for name, in cursor.fetchall()}
+        if self.fts_table not in present:
+            # Not installed yet, or migrated back past the install
+            return []
+        return [name for name in self.trigger_names if name not in present]
+
+    def repair_after_migrate(self, using, verbosity=1, stdout=None, **kwargs):
+        """
+        ``post_migrate`` receiver: reinstall triggers a table remake dropped,
+        then reindex. Reports to the ``stdout`` that ``migrate`` passes along.
+        """
+        connection = connections[using]
+        missing = self.missing_triggers(connection)
+        if not missing:
+            return
+        with connection.cursor() as cursor:
+            for sql in self.install_sql(connection):
+                cursor.execute(sql)
+        if verbosity >= 1:
+            (stdout or sys.stdout).write(
+                f'  Reinstalled search triggers {", ".join(missing)} and reindexed {self.table}.\n'
+            )
+
+    def search(self, queryset, query):
+        """Narrow ``queryset`` to rows matching ``query``, best match first."""
+        terms = TERM_RE.findall(query)
+        if not terms:
+            return queryset.none()
+
+        connection = connections[queryset.db]
+        quote = connection.ops.quote_name
+        if connection.vendor == 'sqlite':
+            match = ' '.join(f'"{term}"*' for term in terms)
+            queryset = queryset.all()
+            query = queryset.query
+            alias = query.join(MatchJoin(self.fts_table, query.get_initial_alias(), None, self.pk, match))
+            return queryset.annotate(
+                search_rank=RawSQL(f'{quote(alias)}.rank', [], output_field=FloatField())
+            ).order_by('search_rank')
+        if connection.vendor == 'postgresql':
+            from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+            # Compiles to the same expression as the GIN index, so the index is used
+            vector = SearchVector(*self.columns, config='simple')
+            tsquery = SearchQuery(' & '.join(f"'{term}':*" for term in terms), search_type='raw', config='simple')
+            return queryset.alias(search_vector=vector).filter(search_vector=tsquery).annotate(
+                search_rank=SearchRank(F('search_vector'), tsquery)
+            ).order_by('-search_rank')
+
+        condition = Q()
+        for term in terms:
+            term_condition = Q()
+            for column in self.columns:
+                term_condition |= Q(**{f'{column}__icontains': term})
+            condition &= term_condition
+        return queryset.filter(condition)
+
+
+class SearchMixin:
+    """
+    ``?q=`` on the list action: the best ``page_size`` matches for the query,
+    ranked, after the usual list filters. Search results are a single page,
+    so ``next``/``previous`` are always null.
+    """
+    search_index = None
+    search_param = 'q'
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.search_index.search(self.filter_queryset(self.get_queryset()), query)
+        if self.paginator is not None:
+            queryset = queryset[:self.paginator.get_page_size(request)]
+        serializer = self.get_serializer(queryset, many=True)
+        return Response({'next': None, 'previous': None, 'results': serializer.data})
@@ -0,0 +1,159 @@
+"""
+Slow-query log. Statements slower than ``SLOW_QUERY_MS`` are logged to the
+``core.slow_queries`` logger as one JSON object per line:
+
+    {"ts", "duration_ms", "fingerprint", "sql", "route", "stack", "plan", "alias"}
+
+``sql`` is normalized (literals and placeholders become ``?``, IN lists
+collapse) so repeats of one statement share a fingerprint. Parameters are
+never logged, since they are patient data. ``plan`` is the backend's EXPLAIN
+output (``EXPLAIN QUERY PLAN`` on SQLite), captured the first time a
+fingerprint is seen by each process. ``python manage.py slow_queries`` ranks
+fingerprints by total time.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import traceback
+from contextlib import nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from time import perf_counter
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger('core.slow_queries')
+
+# Project frames kept in the call-site stack, innermost last
+STACK_DEPTH = 8
+# Fingerprints explained by this process; cleared when it grows past the limit
+EXPLAINED_LIMIT = 1000
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w."])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\bIN \((?:\?, )*\?\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'(\((?:\?, )*\?\))(?:, \((?:\?, )*\?\))+')
+_SPACE = re.compile(r'\s+')
+
+_current_logger = ContextVar('slow_query_logger', default=None)
+_explaining = ContextVar('slow_query_explaining', default=False)
+_explained = set()
+_explained_lock = threading.Lock()
+
+
+def normalize(sql):
+    """SQL with literals replaced by ``?`` and IN/VALUES lists collapsed."""
+    sql = _STRING.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _SPACE.sub(' ', sql).strip()
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _VALUES_LIST.sub(r'\1, ...', sql)
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+def call_site():
+    """``path:line in function`` of the innermost project frames."""
+    base = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(base) and 'site-packages' not in frame.filename
+        and not frame.filename.endswith(('slow_queries.py', 'middleware.py'))
+    ]
+    return [
+        f'{frame.filename[len(base) + 1:]}:{frame.lineno} in {frame.name}'
+        for frame in frames[-STACK_DEPTH:]
+    ]
+
+
+def explain(connection, sql, params):
+    token = _explaining.set(True)
+    try:
+        # Inside the request's transaction (e.g. a booking's select_for_update)
+        # run it in a savepoint: a failed EXPLAIN then rolls back only itself,
+        # instead of leaving PostgreSQL's transaction aborted for the request
+        savepoint = transaction.atomic(using=connection.alias) if connection.in_atomic_block else nullcontext()
+        with savepoint, connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return [str(row[-1]) for row in cursor.fetchall()]
+    except (DatabaseError, NotImplementedError) as exc:
+        return [f'EXPLAIN failed: {exc}']
+    finally:
+        _explaining.reset(token)
+
+
+def claim_plan(key):
+    """True for the first caller in this process to log fingerprint ``key``."""
+    with _explained_lock:
+        if key in _explained:
+            return False
+        if len(_explained) >= EXPLAINED_LIMIT:
+            _explained.clear()
+        _explained.add(key)
+        return True
+
+
+class SlowQueryLogger:
+    """Execute wrapper logging statements slower than ``threshold_ms``."""
+
+    def __init__(self, threshold_ms, request=None):
+        self.threshold = threshold_ms / 1000
+        self.request = request
+
+    def route(self):
+        if self.request is None:
+            return None
+        match = getattr(self.request, 'resolver_match', None)
+        name = match.view_name if match is not None else self.request.path
+        return f'{self.request.method} {name}'
+
+    def __call__(self, execute, sql, params, many, context):
+        if _explaining.get():
+            return execute(sql, params, many, context)
+        started = perf_counter()
+        result = execute(sql, params, many, context)
+        duration = perf_counter() - started
+        if duration >= self.threshold:
+            self.log(sql, params, many, context['connection'], duration)
+        return result
+
+    def log(self, sql, params, many, connection, duration):
+        normalized = normalize(sql)
+        key = fingerprint(normalized)
+        plan = None
+        if not many and sql.lstrip()[:6].upper().startswith(EXPLAINABLE) and claim_plan(key):
+            plan = explain(connection, sql, params)
+        logger.warning(json.dumps({
+            'ts': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': round(duration * 1000, 3),
+            'fingerprint': key,
+            'sql': normalized,
+            'route': self.route(),
+            'stack': call_site(),
+            'plan': plan,
+            'alias': connection.alias,
+        }))
+
+
+def begin_request(threshold_ms, request):
+    return _current_logger.set(SlowQueryLogger(threshold_ms, request))
+
+
+def end_request(token):
+    _current_logger.reset(token)
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """Execute wrapper handing the query to the current request's SlowQueryLogger, if any."""
+    slow_query_logger = _current_logger.get()
+    if slow_query_logger is None:
+        return execute(sql, params, many, context)
+    return slow_query_logger(execute, sql, params, many, context)
@@ -0,0 +1,252 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import date, time, timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from appointments.models import Appointment
+from doctors.models import Doctor
+from mappings.models import PatientDoctorMapping
+from patients.models import Patient
+from . import db_routers, metrics, slow_queries
+from .management.commands.generate_data import DAY_END_HOUR, DAY_START_HOUR
+from .middleware import ReplicaRoutingMiddleware, RequestMetricsMiddleware, SlowQueryLogMiddleware
+
+
+class SharedCacheSettingsTests(SimpleTestCase):
+    def import_settings(self, **env):
+        environ = {key: value for key, value in os.environ.items() if key not in ('REDIS_URL', 'CACHE_LOCATION')}
+        return subprocess.run(
+            [sys.executable, '-c', 'import healthcare.settings'], cwd=settings.BASE_DIR,
+            env={**environ, **env}, capture_output=True, text=True,
+        )
+
+    def test_production_refuses_per_process_caches(self):
+        for env in ({}, {'CACHE_LOCATION': '/tmp/cache'}):
+            result = self.import_settings(DJANGO_DEBUG='0', **env)
+            self.assertNotEqual(result.returncode, 0)
+            self.assertIn('ImproperlyConfigured', result.stderr)
+
+    def test_shared_cache_or_debug_is_accepted(self):
+        self.assertEqual(self.import_settings(DJANGO_DEBUG='0', REDIS_URL='redis://cache:6379/0').returncode, 0)
+        self.assertEqual(self.import_settings(DJANGO_DEBUG='1').returncode, 0)
+
+
+@override_settings(SLOW_QUERY_MS=0)
+class SlowQueryLogTests(APITestCase):
+    def setUp(self):
+        slow_queries._explained.clear()
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.doctor = Doctor.objects.create(
+            user=self.user, first_name='Greg', last_name='House',
+            specialization='GP', contact_number='555', license_number='LIC1',
+            hospital='General',
+        )
+        self.patient = Patient.objects.create(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+
+    def book(self, start):
+        payload = {'doctor': self.doctor.id, 'patient': self.patient.id, 'appointment_datetime': start}
+        return self.client.post('/api/appointments/', payload, format='json')
+
+    def test_statements_are_logged_with_plan_and_call_site(self):
+        with self.assertLogs('core.slow_queries') as logs:
+            self.book('2030-01-01T10:00:00Z')
+            self.book('2030-01-01T11:00:00Z')
+        entries = [json.loads(record.getMessage()) for record in logs.records]
+
+        conflict_checks = [entry for entry in entries if 'appointment_datetime' in entry['sql']
+                           and entry['sql'].startswith('SELECT ? AS "a"')]
+        self.assertEqual(len(conflict_checks), 2)
+        first, second = conflict_checks
+        self.assertEqual(first['fingerprint'], second['fingerprint'])
+        self.assertNotIn('2030', first['sql'])
+        self.assertEqual(first['route'], 'POST appointment-list')
+        self.assertTrue(any(frame.startswith('appointments/serializers.py') for frame in first['stack']))
+        # Explained once per fingerprint
+        self.assertTrue(first['plan'])
+        self.assertIsNone(second['plan'])
+
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as log:
+            log.write(''.join(f'{record.getMessage()}\n' for record in logs.records))
+            log.flush()
+            out = StringIO()
+            call_command('slow_queries', path=log.name, limit=100, as_json=True, stdout=out)
+        report = [json.loads(line) for line in out.getvalue().splitlines()]
+        totals = [group['total_ms'] for group in report]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+        check = next(group for group in report if group['fingerprint'] == first['fingerprint'])
+        self.assertEqual(check['count'], 2)
+        self.assertEqual(check['plan'], first['plan'])
+
+    def test_failed_explain_rolls_back_only_its_savepoint(self):
+        with transaction.atomic(), CaptureQueriesContext(connection) as queries:
+            with mock.patch.object(connection.ops, 'explain_query_prefix', return_value='EXPLAIN BOGUS'):
+                plan = slow_queries.explain(connection, 'SELECT 1', None)
+            self.assertTrue(plan[0].startswith('EXPLAIN failed'))
+            self.assertFalse(connection.needs_rollback)
+            self.assertEqual(User.objects.count(), 1)
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertTrue(any(sql.startswith('SAVEPOINT') for sql in statements))
+        self.assertTrue(any(sql.startswith('ROLLBACK TO SAVEPOINT') for sql in statements))
+
+    def test_normalize(self):
+        self.assertEqual(
+            slow_queries.normalize("SELECT \"t1\".\"id\" FROM t1 WHERE x IN (%s, %s, %s) AND y = 'a''b'  LIMIT 21"),
+            'SELECT "t1"."id" FROM t1 WHERE x IN (...) AND y = ? LIMIT ?',
+        )
+
+
+@override_settings(REPLICA_DATABASES=['replica'], DB_REPLICA_STICKY_SECONDS=60)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = db_routers.PrimaryReplicaRouter()
+        self.user = User(pk=1, username='owner')
+
+    def route(self, method, user=None, write=False):
+        request = RequestFactory().generic(method, '/api/doctors/')
+        request.user = user or self.user
+        token = db_routers.begin_request(request)
+        try:
+            if write:
+                self.router.db_for_write(Doctor)
+            return self.router.db_for_read(Doctor)
+        finally:
+            db_routers.end_request(token)
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.assertEqual(self.route('GET'), 'replica')
+
+    def test_unsafe_and_unauthenticated_requests_use_the_primary(self):
+        self.assertIsNone(self.route('POST'))
+        self.assertIsNone(self.route('GET', user=AnonymousUser()))
+        self.assertIsNone(self.route('GET', user=SimpleLazyObject(lambda: self.user)))
+
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        self.route('PATCH', write=True)
+        self.assertIsNone(self.route('GET'))
+        self.assertEqual(self.route('GET', user=User(pk=2, username='other')), 'replica')
+
+    def test_reads_outside_requests_use_the_primary(self):
+        self.assertIsNone(self.router.db_for_read(Doctor))
+
+
+@override_settings(REQUEST_METRICS=True)
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        metrics.registry.reset()
+        self.owner = User.objects.create_user(username='owner', password='pass12345')
+        self.doctor = Doctor.objects.create(
+            user=self.owner, first_name='Greg', last_name='House', specialization='GP',
+            contact_number='555', license_number='LIC1', hospital='General',
+        )
+        patient = Patient.objects.create(
+            user=self.owner, first_name='Ada', last_name='Patient',
+            date_of_birth=date(1990, 1, 1), gender='O', contact_number='555',
+        )
+        PatientDoctorMapping.objects.create(patient=patient, doctor=self.doctor)
+
+    def test_server_timing_and_route_histograms(self):
+        self.client.force_authenticate(self.owner)
+        for _ in range(3):
+            response = self.client.get(f'/api/doctors/{self.doctor.id}/patients/')
+        timing = {
+            entry.split(';')[0]: entry for entry in response['Server-Timing'].split(', ')
+        }
+        self.assertEqual(sorted(timing), ['db', 'serialize', 'total', 'view'])
+        self.assertIn('desc="2 queries"', timing['db'])
+
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+        self.client.force_authenticate(User.objects.create_user(username='ops', is_staff=True))
+        routes = self.client.get('/api/metrics/').data['routes']
+        route = routes['GET doctor-patients']
+        self.assertEqual(route['requests'], 3)
+        self.assertEqual(route['queries']['p99'], 2)
+        self.assertLessEqual(route['total_ms']['p50'], route['total_ms']['max'])
+
+        self.assertEqual(self.client.delete('/api/metrics/').status_code, 204)
+        self.assertEqual(list(self.client.get('/api/metrics/').data['routes']), ['DELETE metrics'])
+
+    async def test_async_views_are_measured_without_leaving_async_mode(self):
+        async def view(request):
+            return HttpResponse()
+
+        with override_settings(SLOW_QUERY_MS=1000, REPLICA_DATABASES=['replica']):
+            for middleware_class in (RequestMetricsMiddleware, SlowQueryLogMiddleware, ReplicaRoutingMiddleware):
+                self.assertTrue(iscoroutinefunction(middleware_class(view)), middleware_class)
+
+        response = await self.async_client.get(
+            '/api/async/doctors/', headers={'Authorization': f'Bearer {AccessToken.for_user(self.owner)}'},
+        )
+        self.assertEqual(response.status_code, 200)
+        # The query wrapper reached the thread the async view ran its ORM calls in
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+
+class GenerateDataTests(APITestCase):
+    def test_generates_consistent_rows(self):
+        out = StringIO()
+        call_command(
+            'generate_data', seed=7, users=3, patients=30, doctors=4, appointments=120,
+            batch_size=25, days_back=2, days_ahead=2, stdout=out,
+        )
+        self.assertEqual(User.objects.filter(username__startswith='synthetic-7-').count(), 3)
+        self.assertEqual(Patient.objects.count(), 30)
+        self.assertEqual(PatientDoctorMapping.objects.count(), 60)
+        self.assertEqual(Appointment.objects.count(), 120)
+
+        for doctor in Doctor.objects.all():
+            slots = list(doctor.appointments.order_by('appointment_datetime').values_list(
+                'appointment_datetime', 'end_datetime',
+            ))
+            self.assertTrue(all(end <= next_start for (_, end), (next_start, _) in zip(slots, slots[1:])))
+            active = doctor.patient_mappings.filter(is_active=True).count()
+            self.assertEqual(doctor.active_patient_count, active)
+        self.assertTrue(self.client.login(username='synthetic-7-0', password='synthetic-pass'))
+
+        with self.assertRaises(CommandError):
+            call_command('generate_data', seed=7, users=1, patients=1, doctors=1, appointments=1, stdout=out)
+
+    def test_appointments_stay_in_working_hours(self):
+        # Few bookings per doctor over the window, so most days have free time to spare
+        now = timezone.now()
+        call_command(
+            'generate_data', seed=8, users=2, patients=10, doctors=3, appointments=24,
+            days_back=5, days_ahead=5, stdout=StringIO(),
+        )
+        first_day = date.today() - timedelta(days=5)
+        starts = []
+        for start, end in Appointment.objects.values_list('appointment_datetime', 'end_datetime'):
+            self.assertGreaterEqual(start.hour, DAY_START_HOUR)
+            self.assertEqual(end.date(), start.date())
+            self.assertLessEqual(end.time(), time(DAY_END_HOUR))
+            self.assertTrue(first_day <= start.date() < first_day + timedelta(days=10))
+            starts.append(start)
+        self.assertTrue(any(start > now for start in starts))
+        self.assertTrue(any(start < now for start in starts))
+        with self.assertRaises(CommandError):
+            call_command(
+                'generate_data', seed=9, users=1, patients=1, doctors=1, appointments=21,
+                days_back=1, days_ahead=1, stdout=StringIO(),
+            )
@@ -0,0 +1,22 @@
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import metrics
+
+
+class MetricsView(APIView):
+    """
+    Per-route request metrics of this process since start or the last reset:
+    p50/p95/p99, mean and max of total time, SQL time and serializer time (ms)
+    and of the query count. ``DELETE`` resets them. Staff only.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({'enabled': settings.REQUEST_METRICS, 'routes': metrics.registry.snapshot()})
+
+    def delete(self, request):
+        metrics.registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
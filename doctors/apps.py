@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def repair_search_index(sender, **kwargs):
+    # Imported here so startup does not load the search module (and DRF)
+    from .search import doctor_search
+
+    doctor_search.repair_after_migrate(**kwargs)
 
 
 class DoctorsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "doctors"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(repair_search_index, sender=self)
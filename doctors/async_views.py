@@ -0,0 +1,17 @@
+from django_filters.filterset import filterset_factory
+
+from core.async_api import async_api_view, json_response, paginated_response
+from .models import Doctor
+from .serializers import DoctorListSerializer
+
+# Same filters as DoctorViewSet.filterset_fields
+DoctorFilter = filterset_factory(Doctor, fields=['specialization', 'hospital'])
+
+
+@async_api_view
+async def doctor_list(request):
+    """Async counterpart of ``GET /api/doctors/``."""
+    filterset = DoctorFilter(request.GET, queryset=Doctor.objects.all())
+    if not filterset.is_valid():
+        return json_response(filterset.errors, 400)
+    return await paginated_response(request, filterset.qs, DoctorListSerializer)
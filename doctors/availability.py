@@ -0,0 +1,73 @@
+# doctors/availability.py
+import re
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+DEFAULT_WINDOW = timedelta(days=7)
+MAX_WINDOW = timedelta(days=31)
+DEFAULT_SLOT = timedelta(minutes=30)
+MAX_SLOT = timedelta(hours=24)
+
+_SLOT_RE = re.compile(r'^(\d+)\s*([mh]?)$')
+
+
+def parse_slot(value):
+    """Parse a slot length such as ``30m``, ``1h`` or ``45`` (minutes)."""
+    if not value:
+        return DEFAULT_SLOT
+    match = _SLOT_RE.match(value.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError('slot must look like 30m, 1h or a number of minutes.')
+    amount, unit = int(match.group(1)), match.group(2)
+    minutes = amount * 60 if unit == 'h' else amount
+    # Checked before building the timedelta, which overflows on huge values
+    if minutes > MAX_SLOT.total_seconds() // 60:
+        raise ValueError(f'slot cannot exceed {MAX_SLOT.total_seconds() // 3600:.0f}h.')
+    return timedelta(minutes=minutes)
+
+
+def _parse_moment(value, name):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'{name} must be an ISO 8601 date or datetime.')
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def parse_window(params):
+    """Read ``from``, ``to`` and ``slot`` query parameters into a search window."""
+    start = _parse_moment(params['from'], 'from') if params.get('from') else timezone.now()
+    end = _parse_moment(params['to'], 'to') if params.get('to') else start + DEFAULT_WINDOW
+    slot = parse_slot(params.get('slot'))
+
+    if end <= start:
+        raise ValueError('to must be after from.')
+    if end - start > MAX_WINDOW:
+        raise ValueError(f'The search window cannot exceed {MAX_WINDOW.days} days.')
+    return start, end, slot
+
+
+def free_slots(busy, start, end, slot):
+    """
+    Yield free ``(slot_start, slot_end)`` pairs inside [start, end).
+
+    ``busy`` must be sorted by start time. A single sweep advances a cursor past
+    each busy interval and emits back-to-back slots in the gaps between them.
+    """
+    cursor = start
+    for busy_start, busy_end in busy:
+        gap_end = min(busy_start, end)
+        while cursor + slot <= gap_end:
+            yield cursor, cursor + slot
+            cursor += slot
+        cursor = max(cursor, busy_end)
+        if cursor >= end:
+            return
+    while cursor + slot <= end:
+        yield cursor, cursor + slot
+        cursor += slot
@@ -0,0 +1,41 @@
+# doctors/cache.py
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = 'doctors:directory:version'
+
+
+def directory_version():
+    """Current version of the doctor directory; cached pages embed it in their key."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_directory_version():
+    """Invalidate every cached directory page at once."""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def directory_etag(request):
+    # The page body depends on the query string, the host (pagination links)
+    # and the negotiated format, so all of them are part of the tag
+    source = ':'.join([
+        str(directory_version()),
+        request.get_host(),
+        request.get_full_path(),
+        request.accepted_renderer.format,
+    ])
+    return hashlib.md5(source.encode()).hexdigest()
+
+
+def get_directory_page(etag):
+    return cache.get(f'doctors:directory:{etag}')
+
+
+def set_directory_page(etag, data):
+    cache.set(f'doctors:directory:{etag}', data, settings.DOCTOR_DIRECTORY_CACHE_TIMEOUT)
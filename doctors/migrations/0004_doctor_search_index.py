@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from doctors.search import doctor_search
+
+
+def install(apps, schema_editor):
+    doctor_search.install(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    doctor_search.uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("doctors", "0003_doctor_active_patient_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -26,11 +26,16 @@ class Doctor(models.Model):
     hospital = models.CharField(max_length=200)
     address = models.TextField(blank=True)
     experience_years = models.PositiveIntegerField(default=0)
+    # Active PatientDoctorMapping rows, maintained by mappings.signals
+    active_patient_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"Dr. {self.first_name} {self.last_name}"
\ No newline at end of file
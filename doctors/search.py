@@ -0,0 +1,4 @@
+from core.search import SearchIndex
+
+# Directory lookups: name, hospital or specialization
+doctor_search = SearchIndex('doctors_doctor', ('first_name', 'last_name', 'hospital', 'specialization'))
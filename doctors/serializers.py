@@ -7,7 +7,7 @@ class DoctorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Doctor
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('active_patient_count', 'created_at', 'updated_at')
 
 
 class DoctorListSerializer(serializers.ModelSerializer):
@@ -15,4 +15,4 @@ class DoctorListSerializer(serializers.ModelSerializer):
         model = Doctor
         fields = ('id', 'first_name', 'last_name', 'specialization', 
                  'contact_number', 'email', 'license_number', 
-                 'hospital', 'experience_years', 'created_at')
\ No newline at end of file
+                 'hospital', 'experience_years', 'active_patient_count', 'created_at')
\ No newline at end of file
@@ -1,3 +1,308 @@
-from django.test import TestCase
+import json
+from datetime import date, datetime, timezone
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment
+from mappings.models import PatientDoctorMapping
+from patients.models import Patient
+from .models import Doctor
+
+
+class DoctorListPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        for i in range(5):
+            Doctor.objects.create(
+                user=self.user, first_name=f'Doc{i}', last_name='Test',
+                specialization='GP', contact_number='555', license_number=f'LIC{i}',
+                hospital='General',
+            )
+
+    def test_list_is_cursor_paginated(self):
+        response = self.client.get('/api/doctors/', {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+        seen = [row['id'] for row in response.data['results']]
+        next_url = response.data['next']
+        while next_url:
+            response = self.client.get(next_url)
+            seen.extend(row['id'] for row in response.data['results'])
+            next_url = response.data['next']
+
+        expected = list(Doctor.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+
+class DoctorDirectoryCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.add_doctor('LIC1')
+
+    def add_doctor(self, license_number):
+        return Doctor.objects.create(
+            user=self.user, first_name='Doc', last_name=license_number,
+            specialization='GP', contact_number='555', license_number=license_number,
+            hospital='General',
+        )
+
+    def test_directory_pages_are_cached_and_revalidated(self):
+        with self.assertNumQueries(1):
+            first = self.client.get('/api/doctors/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/doctors/')
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first['ETag'], second['ETag'])
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/doctors/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_doctor_writes_invalidate_the_directory(self):
+        etag = self.client.get('/api/doctors/')['ETag']
+        self.add_doctor('LIC2')
+
+        response = self.client.get('/api/doctors/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.data['results']), 2)
+
+
+class DoctorAvailabilityTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.patient = Patient.objects.create(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+        self.busy = self.add_doctor('Busy', 'CAR')
+        self.free = self.add_doctor('Free', 'CAR')
+        self.other = self.add_doctor('Other', 'GP')
+        self.book(self.busy, 9, 0, 60)
+        self.book(self.busy, 10, 30, 30)
+        self.book(self.free, 9, 0, 30)
+        self.book(self.free, 9, 30, 30)
+
+    def add_doctor(self, name, specialization):
+        return Doctor.objects.create(
+            user=self.user, first_name=name, last_name='Test',
+            specialization=specialization, contact_number='555', license_number=f'LIC-{name}',
+            hospital='General',
+        )
+
+    def book(self, doctor, hour, minute, duration):
+        Appointment.objects.create(
+            doctor=doctor, patient=self.patient, duration_minutes=duration,
+            appointment_datetime=datetime(2030, 1, 1, hour, minute, tzinfo=timezone.utc),
+        )
+
+    def test_free_slots_skip_booked_intervals(self):
+        response = self.client.get(f'/api/doctors/{self.busy.id}/availability/', {
+            'from': '2030-01-01T09:00:00Z', 'to': '2030-01-01T12:00:00Z', 'slot': '30m',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [slot['start'] for slot in response.data['slots']],
+            ['2030-01-01T10:00:00Z', '2030-01-01T11:00:00Z', '2030-01-01T11:30:00Z'],
+        )
+
+    def test_first_free_doctor_by_specialization(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/doctors/availability/', {
+                'specialization': 'CAR', 'from': '2030-01-01T09:00:00Z', 'to': '2030-01-02', 'slot': '1h',
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row['id'], row['start']) for row in response.data['results']],
+            [(self.free.id, '2030-01-01T10:00:00Z'), (self.busy.id, '2030-01-01T11:00:00Z')],
+        )
+
+    def test_invalid_window_is_rejected(self):
+        response = self.client.get(f'/api/doctors/{self.busy.id}/availability/', {
+            'from': '2030-01-02', 'to': '2030-01-01',
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_oversized_slot_is_rejected(self):
+        for slot in ('99999999999h', '25h', '1441'):
+            response = self.client.get(f'/api/doctors/{self.busy.id}/availability/', {'slot': slot})
+            self.assertEqual(response.status_code, 400, slot)
+        response = self.client.get(f'/api/doctors/{self.busy.id}/availability/', {'slot': '24h'})
+        self.assertEqual(response.status_code, 200)
+
+
+class DoctorBulkTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        Doctor.objects.create(
+            user=self.user, first_name='Existing', last_name='Test',
+            specialization='GP', contact_number='555', license_number='TAKEN',
+            hospital='General',
+        )
+
+    def row(self, license_number, **extra):
+        return {
+            'first_name': 'Bulk', 'last_name': license_number, 'specialization': 'GP',
+            'contact_number': '555', 'license_number': license_number, 'hospital': 'General',
+            **extra,
+        }
+
+    def test_bulk_create_reports_per_row_errors(self):
+        rows = [self.row('A1'), self.row('TAKEN'), self.row('A2'), self.row('A1'), self.row('A3', specialization='XX')]
+        # One query for uniqueness, one transaction around the INSERT
+        with self.assertNumQueries(4):
+            response = self.client.post('/api/doctors/bulk/', rows, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(len(response.data['created']), 2)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 3, 4])
+        self.assertIn('license_number', response.data['errors'][0]['errors'])
+        self.assertEqual(
+            set(Doctor.objects.filter(user=self.user).values_list('license_number', flat=True)),
+            {'TAKEN', 'A1', 'A2'},
+        )
+
+    def test_bulk_create_accepts_ndjson(self):
+        body = '\n'.join(json.dumps(self.row(f'N{i}')) for i in range(3)) + '\n'
+        response = self.client.post('/api/doctors/bulk/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Doctor.objects.filter(license_number__startswith='N').count(), 3)
+
+    def test_bulk_update_only_touches_own_doctors(self):
+        other = User.objects.create_user(username='other', password='pass12345')
+        foreign = Doctor.objects.create(
+            user=other, first_name='Foreign', last_name='Test',
+            specialization='GP', contact_number='555', license_number='FOREIGN',
+            hospital='General',
+        )
+        own = Doctor.objects.get(license_number='TAKEN')
+        response = self.client.patch('/api/doctors/bulk/', [
+            {'id': own.id, 'hospital': 'Mercy'},
+            {'id': foreign.id, 'hospital': 'Mercy'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['updated'], [own.id])
+        own.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual((own.hospital, foreign.hospital), ('Mercy', 'General'))
+
+    def test_bulk_update_rejects_malformed_ids(self):
+        own = Doctor.objects.get(license_number='TAKEN')
+        response = self.client.patch('/api/doctors/bulk/', [
+            {'id': [own.id], 'hospital': 'Mercy'},
+            {'id': {}, 'hospital': 'Mercy'},
+            {'id': True, 'hospital': 'Mercy'},
+            {'id': own.id, 'hospital': 'Mercy'},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['updated'], [own.id])
+        self.assertEqual(
+            [(error['index'], error['errors']) for error in response.data['errors']],
+            [(index, {'id': ['A valid integer is required.']}) for index in range(3)],
+        )
+
+
+class DoctorSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+
+    def test_ranked_prefix_search_includes_bulk_created_rows(self):
+        rows = [
+            {'first_name': 'Meredith', 'last_name': 'Grey', 'specialization': 'GP',
+             'contact_number': '555', 'license_number': 'LIC1', 'hospital': 'Grey Sloan Memorial'},
+            {'first_name': 'Gregory', 'last_name': 'House', 'specialization': 'NEU',
+             'contact_number': '555', 'license_number': 'LIC2', 'hospital': 'Princeton Plainsboro'},
+        ]
+        self.assertEqual(self.client.post('/api/doctors/bulk/', rows, format='json').status_code, 201)
+
+        response = self.client.get('/api/doctors/', {'q': 'neu princeton'})
+        self.assertEqual([row['last_name'] for row in response.data['results']], ['House'])
+
+        # "grey" matches the first doctor twice (name and hospital), so it ranks first
+        response = self.client.get('/api/doctors/', {'q': 'gre'})
+        self.assertEqual([row['last_name'] for row in response.data['results']], ['Grey', 'House'])
+
+
+class DoctorPatientsTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass12345')
+        self.other = User.objects.create_user(username='other', password='pass12345')
+        self.doctor = Doctor.objects.create(
+            user=self.owner, first_name='Greg', last_name='House', specialization='GP',
+            contact_number='555', license_number='LIC1', hospital='General',
+        )
+        self.own = self.assign(self.owner, 'Own')
+        self.foreign = self.assign(self.other, 'Foreign')
+        self.assign(self.owner, 'Former', is_active=False)
+
+    def assign(self, user, name, is_active=True):
+        patient = Patient.objects.create(
+            user=user, first_name=name, last_name='Patient',
+            date_of_birth=date(1990, 1, 1), gender='O', contact_number='555',
+        )
+        PatientDoctorMapping.objects.create(patient=patient, doctor=self.doctor, is_active=is_active)
+        return patient
+
+    def patient_ids(self, user):
+        self.client.force_authenticate(user)
+        # Doctor lookup, then one page of patients joined through the mappings
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/doctors/{self.doctor.id}/patients/')
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['id'] for row in response.data['results'])
+
+    def test_doctor_owner_sees_every_active_patient(self):
+        self.assertEqual(self.patient_ids(self.owner), sorted([self.own.id, self.foreign.id]))
+
+    def test_other_users_see_only_their_own_patients(self):
+        self.assertEqual(self.patient_ids(self.other), [self.foreign.id])
+
+
+class DoctorOwnershipTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass12345')
+        self.other = User.objects.create_user(username='other', password='pass12345')
+        self.doctor = Doctor.objects.create(
+            user=self.owner, first_name='Greg', last_name='House', specialization='GP',
+            contact_number='555', license_number='LIC1', hospital='General',
+        )
+        self.url = f'/api/doctors/{self.doctor.id}/'
+
+    def test_owner_update_is_one_fetch_and_one_update(self):
+        self.client.force_authenticate(self.owner)
+        with self.assertNumQueries(2):
+            response = self.client.patch(self.url, {'hospital': 'Princeton'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['hospital'], 'Princeton')
+
+    def test_owner_delete(self):
+        self.client.force_authenticate(self.owner)
+        # Fetch, the mappings and appointments Django collects for their signals, then the DELETE
+        with self.assertNumQueries(4):
+            response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Doctor.objects.filter(pk=self.doctor.pk).exists())
+
+    def test_other_users_can_read_but_not_write(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.client.patch(self.url, {'hospital': 'Princeton'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.delete(self.url).status_code, 404)
+        self.doctor.refresh_from_db()
+        self.assertEqual(self.doctor.hospital, 'General')
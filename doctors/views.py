@@ -1,10 +1,31 @@
-from rest_framework import viewsets, permissions, status
+from itertools import groupby
+from rest_framework import viewsets, permissions, serializers, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from appointments.models import Appointment
+from core.bulk import BulkModelMixin
+from core.conditional import ConditionalRequestMixin, etag_matches
+from core.fastpath import FastListMixin
+from core.ownership import OwnerScopedMixin
+from core.search import SearchMixin
+from patients.ages import request_today
+from patients.models import Patient
+from patients.serializers import PatientListSerializer
+from .availability import free_slots, parse_window
+from .cache import bump_directory_version, directory_etag, get_directory_page, set_directory_page
 from .models import Doctor
+from .search import doctor_search
 from .serializers import DoctorSerializer, DoctorListSerializer
 
-class DoctorViewSet(viewsets.ModelViewSet):
+# Upper bound on doctors considered by a single multi-doctor availability search
+MAX_AVAILABILITY_DOCTORS = 200
+
+
+class DoctorViewSet(OwnerScopedMixin, BulkModelMixin, ConditionalRequestMixin, SearchMixin, FastListMixin,
+                    viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    filterset_fields = ['specialization', 'hospital']
+    search_index = doctor_search
     
     def get_queryset(self):
         # All authenticated users can view all doctors
@@ -18,26 +39,137 @@ class DoctorViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
     
+    def list(self, request, *args, **kwargs):
+        # The directory is the same for every user, so pages are shared and
+        # versioned; any doctor write bumps the version (see doctors.signals)
+        etag = directory_etag(request)
+        headers = {'ETag': f'"{etag}"'}
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        data = get_directory_page(etag)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            set_directory_page(etag, data)
+        return Response(data, headers=headers)
+    
+    def get_bulk_update_queryset(self):
+        # Only doctors the user created can be changed
+        return self.owned(Doctor.objects.all())
+    
+    def perform_bulk_create(self, objs):
+        super().perform_bulk_create(objs)
+        bump_directory_version()
+    
+    def perform_bulk_update(self, objs, fields):
+        super().perform_bulk_update(objs, fields)
+        bump_directory_version()
+    
+    # Only doctors the user created can be changed; get_object() is owner-scoped
+    # for writes (OwnerScopedMixin), so anyone else's doctor is a 404
     def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
         instance = self.get_object()
+        self.check_preconditions(request, instance)
         
-        # Check if the doctor belongs to the current user
-        if instance.user != request.user:
-            return Response(
-                {'error': 'You can only update doctors you created.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        return super().update(request, *args, **kwargs)
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return Response(serializer.data, headers=self.get_validator_headers(instance))
     
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
+        self.check_preconditions(request, instance)
+        
+        self.perform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    @action(detail=True, methods=['GET'])
+    def patients(self, request, pk=None):
+        """
+        Patients actively assigned to this doctor, in one joined query per page.
+        Like mappings, they are visible to the doctor's owner and to each
+        patient's owner.
+        """
+        doctor = self.get_object()
+        queryset = Patient.objects.filter(
+            doctor_mappings__doctor=doctor, doctor_mappings__is_active=True
+        ).with_age(request_today(request))
+        if doctor.user_id != request.user.id:
+            queryset = queryset.filter(user_id=request.user.id)
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(PatientListSerializer(page, many=True).data)
+        return Response(PatientListSerializer(queryset, many=True).data)
+    
+    @action(detail=True, methods=['GET'])
+    def availability(self, request, pk=None):
+        try:
+            start, end, slot = parse_window(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        doctor = self.get_object()
+        busy = Appointment.objects.overlapping(doctor.pk, start, end).order_by(
+            'appointment_datetime'
+        ).values_list('appointment_datetime', 'end_datetime')
+        
+        field = serializers.DateTimeField()
+        return Response({
+            'doctor': doctor.pk,
+            'from': field.to_representation(start),
+            'to': field.to_representation(end),
+            'slot_minutes': int(slot.total_seconds() // 60),
+            'slots': [
+                {'start': field.to_representation(slot_start), 'end': field.to_representation(slot_end)}
+                for slot_start, slot_end in free_slots(busy, start, end, slot)
+            ],
+        })
+    
+    @action(detail=False, methods=['GET'], url_path='availability')
+    def availability_search(self, request):
+        """
+        First free slot for every doctor matching the list filters
+        (e.g. ?specialization=CAR), earliest first, in two queries total.
+        """
+        try:
+            start, end, slot = parse_window(request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        doctors = {
+            doctor['id']: doctor
+            for doctor in self.filter_queryset(self.get_queryset()).values(
+                'id', 'first_name', 'last_name', 'specialization', 'hospital'
+            )[:MAX_AVAILABILITY_DOCTORS]
+        }
+        busy = Appointment.objects.filter(doctor_id__in=doctors).scheduled_between(start, end).order_by(
+            'doctor_id', 'appointment_datetime'
+        ).values_list('doctor_id', 'appointment_datetime', 'end_datetime')
+        busy_by_doctor = {
+            doctor_id: [(busy_start, busy_end) for _, busy_start, busy_end in rows]
+            for doctor_id, rows in groupby(busy, key=lambda row: row[0])
+        }
         
-        # Check if the doctor belongs to the current user
-        if instance.user != request.user:
-            return Response(
-                {'error': 'You can only delete doctors you created.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        field = serializers.DateTimeField()
+        results = []
+        for doctor_id, doctor in doctors.items():
+            first = next(free_slots(busy_by_doctor.get(doctor_id, []), start, end, slot), None)
+            if first is not None:
+                results.append({
+                    **doctor,
+                    'start': first[0],
+                    'end': first[1],
+                })
+        results.sort(key=lambda row: (row['start'], row['id']))
+        for row in results:
+            row['start'] = field.to_representation(row['start'])
+            row['end'] = field.to_representation(row['end'])
         
-        return super().destroy(request, *args, **kwargs)
\ No newline at end of file
+        return Response({
+            'from': field.to_representation(start),
+            'to': field.to_representation(end),
+            'slot_minutes': int(slot.total_seconds() // 60),
+            'results': results,
+        })
@@ -1,112 +0,0 @@
-from rest_framework import serializers
-from django.contrib.auth.models import User
-from .models import Patient, Doctor, PatientDoctorMapping
-from django.contrib.auth.password_validation import validate_password
-
-# User Serializers
-class RegisterSerializer(serializers.ModelSerializer):
-    password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
-    password2 = serializers.CharField(write_only=True, required=True)
-    
-    class Meta:
-        model = User
-        fields = ('username', 'password', 'password2', 'email', 'first_name', 'last_name')
-        extra_kwargs = {
-            'first_name': {'required': True},
-            'last_name': {'required': True},
-            'email': {'required': True}
-        }
-    
-    def validate(self, attrs):
-        if attrs['password'] != attrs['password2']:
-            raise serializers.ValidationError({"password": "Password fields didn't match."})
-        return attrs
-    
-    def create(self, validated_data):
-        user = User.objects.create(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            first_name=validated_data['first_name'],
-            last_name=validated_data['last_name']
-        )
-        user.set_password(validated_data['password'])
-        user.save()
-        return user
-
-
-# Patient Serializers
-class PatientSerializer(serializers.ModelSerializer):
-    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    age = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = Patient
-        fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
-    
-    def get_age(self, obj):
-        from datetime import date
-        today = date.today()
-        return today.year - obj.date_of_birth.year - ((today.month, today.day) < (obj.date_of_birth.month, obj.date_of_birth.day))
-
-
-class PatientListSerializer(serializers.ModelSerializer):
-    age = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = Patient
-        fields = ('id', 'first_name', 'last_name', 'date_of_birth', 'gender', 
-                 'contact_number', 'email', 'age', 'created_at')
-    
-    def get_age(self, obj):
-        from datetime import date
-        today = date.today()
-        return today.year - obj.date_of_birth.year - ((today.month, today.day) < (obj.date_of_birth.month, obj.date_of_birth.day))
-
-
-# Doctor Serializers
-class DoctorSerializer(serializers.ModelSerializer):
-    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    
-    class Meta:
-        model = Doctor
-        fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
-
-
-class DoctorListSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Doctor
-        fields = ('id', 'first_name', 'last_name', 'specialization', 
-                 'contact_number', 'email', 'license_number', 
-                 'hospital', 'experience_years', 'created_at')
-
-
-# Mapping Serializers
-class PatientDoctorMappingSerializer(serializers.ModelSerializer):
-    patient_name = serializers.CharField(source='patient', read_only=True)
-    doctor_name = serializers.CharField(source='doctor', read_only=True)
-    
-    class Meta:
-        model = PatientDoctorMapping
-        fields = '__all__'
-        read_only_fields = ('assigned_date', 'created_at')
-
-
-class PatientDoctorMappingCreateSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = PatientDoctorMapping
-        fields = ('patient', 'doctor', 'reason_for_assignment', 'is_active')
-
-
-class PatientWithDoctorsSerializer(serializers.ModelSerializer):
-    doctors = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = Patient
-        fields = ('id', 'first_name', 'last_name', 'date_of_birth', 
-                 'gender', 'contact_number', 'email', 'doctors')
-    
-    def get_doctors(self, obj):
-        mappings = PatientDoctorMapping.objects.filter(patient=obj, is_active=True)
-        return DoctorListSerializer([mapping.doctor for mapping in mappings], many=True).data
\ No newline at end of file
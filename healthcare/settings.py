@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -23,7 +24,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = "django-insecure-0jn*!%f^=qw=c+gsc@+au9d1f^s52%+y!_qdw#qpemgc$i8693"
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get("DJANGO_DEBUG", "1") == "1"
 
 ALLOWED_HOSTS = []
 
@@ -34,6 +35,9 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# Seconds an authenticated user is served from cache before auth_user is read again
+JWT_PRINCIPAL_CACHE_TIMEOUT = 60
+
 
 # Application definition
 
@@ -47,8 +51,10 @@ INSTALLED_APPS = [
 
     # Rest 
     'rest_framework',
+    'django_filters',
 
     # My apps 
+    'core',
     'accounts',
     'patients',
     'doctors',
@@ -60,14 +66,28 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_FILTER_BACKENDS': [
+        'django_filters.rest_framework.DjangoFilterBackend',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': 50,
 }
 
+# Every entry must be async-capable: one sync-only middleware makes Django run
+# the whole chain in sync mode under ASGI, and the /api/async/ views through
+# async_to_sync. The core.middleware classes support both modes.
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
+    "core.middleware.SlowQueryLogMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -75,8 +95,42 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
 ]
 
+# Server-Timing headers and per-route latency histograms at /api/metrics/
+# (core.metrics). Off by default; when off the middleware is unloaded.
+REQUEST_METRICS = os.environ.get("REQUEST_METRICS") == "1"
+
+# Statements slower than SLOW_QUERY_MS milliseconds are logged with their
+# EXPLAIN plan and call site to SLOW_QUERY_LOG as JSON lines
+# (core.slow_queries); `manage.py slow_queries` ranks them. Unset = off.
+SLOW_QUERY_MS = float(os.environ["SLOW_QUERY_MS"]) if os.environ.get("SLOW_QUERY_MS") else None
+SLOW_QUERY_LOG = os.environ.get("SLOW_QUERY_LOG", str(BASE_DIR / "slow_queries.jsonl"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "message": {"format": "{message}", "style": "{"},
+    },
+    "handlers": {
+        "slow_queries": {
+            "class": "logging.FileHandler",
+            "filename": SLOW_QUERY_LOG,
+            "formatter": "message",
+            "delay": True,
+        },
+    },
+    "loggers": {
+        "core.slow_queries": {
+            "handlers": ["slow_queries"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+}
+
 ROOT_URLCONF = "healthcare.urls"
 
 TEMPLATES = [
@@ -99,13 +153,142 @@ WSGI_APPLICATION = "healthcare.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+#
+# DB_PROFILE selects the backend:
+#   sqlite        - development default, a single file next to manage.py
+#   sqlite-tuned  - single-node deployments: WAL journal, synchronous=NORMAL,
+#                   mmap reads, busy timeout and IMMEDIATE write transactions
+#   postgres      - persistent connections with health checks, or Django's
+#                   native psycopg pool when DB_POOL=1
+#
+# SERVER_INTERFACE=asgi marks an ASGI deployment (uvicorn healthcare.asgi). Async
+# views do not keep persistent connections, so postgres always uses the pool.
+
+DB_PROFILE = os.environ.get("DB_PROFILE", "sqlite")
+SERVER_INTERFACE = os.environ.get("SERVER_INTERFACE", "wsgi")
+
+if DB_PROFILE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DB_NAME", "healthcare"),
+            "USER": os.environ.get("DB_USER", "healthcare"),
+            "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+            "HOST": os.environ.get("DB_HOST", "localhost"),
+            "PORT": os.environ.get("DB_PORT", "5432"),
+            "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+    if os.environ.get("DB_POOL") == "1" or SERVER_INTERFACE == "asgi":
+        # The pool owns connection reuse, so persistent connections must be off
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "20")),
+                "timeout": int(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            },
+        }
+elif DB_PROFILE == "sqlite-tuned":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DB_NAME", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                # Take the write lock at BEGIN so concurrent bookings queue on
+                # the busy timeout instead of failing on lock upgrade
+                "transaction_mode": "IMMEDIATE",
+                "timeout": 20,
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA mmap_size=268435456;"
+                    "PRAGMA cache_size=-20000;"
+                    "PRAGMA temp_store=MEMORY;"
+                ),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DB_NAME", BASE_DIR / "db.sqlite3"),
+        }
+    }
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# Optional read replica. DB_REPLICA_NAME is the replica database name (or SQLite
+# file) and DB_REPLICA_HOST its host for postgres. Safe-method requests read from
+# it; writes and reads by a user within DB_REPLICA_STICKY_SECONDS of their last
+# write stay on the primary.
+REPLICA_DATABASES = []
+if os.environ.get("DB_REPLICA_NAME") or os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "TEST": {"MIRROR": "default"},
     }
-}
+    if "DB_REPLICA_HOST" in os.environ:
+        DATABASES["replica"]["HOST"] = os.environ["DB_REPLICA_HOST"]
+    REPLICA_DATABASES = ["replica"]
+
+DATABASE_ROUTERS = ["core.db_routers.PrimaryReplicaRouter"]
+DB_REPLICA_STICKY_SECONDS = int(os.environ.get("DB_REPLICA_STICKY_SECONDS", "5"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Local memory by default. Set CACHE_LOCATION to a directory to share the cache
+# (and its invalidations) between worker processes on the same host, or
+# REDIS_URL (e.g. redis://cache:6379/0, needs the redis package) to share it
+# between hosts.
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+elif os.environ.get("CACHE_LOCATION"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ["CACHE_LOCATION"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Idempotency keys are claimed with cache.add (core.idempotency), and a changed
+# or deactivated user is dropped from the JWT principal cache by invalidation
+# (accounts.authentication). Both are only correct when every worker shares one
+# cache with an atomic add. The local-memory and file backends don't provide
+# that, so they are refused outside DEBUG.
+SHARED_CACHE_BACKENDS = (
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+)
+if not DEBUG and CACHES["default"]["BACKEND"] not in SHARED_CACHE_BACKENDS:
+    from django.core.exceptions import ImproperlyConfigured
+
+    raise ImproperlyConfigured(
+        f"With DEBUG off the default cache must be shared by all workers and support an atomic "
+        f"add (Redis or Memcached), not {CACHES['default']['BACKEND']}. Set REDIS_URL."
+    )
+
+# Seconds a rendered doctor directory page is kept; doctor writes invalidate it sooner
+DOCTOR_DIRECTORY_CACHE_TIMEOUT = 300
+
+# Seconds the first response to an Idempotency-Key is replayed for (see core.idempotency)
+IDEMPOTENCY_KEY_TIMEOUT = 60 * 60 * 24
 
 
 # Password validation
@@ -18,6 +18,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from appointments import async_views as appointment_async_views
+from doctors import async_views as doctor_async_views
+from mappings import async_views as mapping_async_views
+from patients import async_views as patient_async_views
+from core.views import MetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -40,4 +45,13 @@ urlpatterns = [
 
     # Appointments
     path('api/appointments/', include('appointments.urls')),
+
+    # Async read endpoints for ASGI deployments
+    path('api/async/patients/', patient_async_views.patient_list),
+    path('api/async/doctors/', doctor_async_views.doctor_list),
+    path('api/async/mappings/patient/<int:patient_id>/', mapping_async_views.patient_doctors),
+    path('api/async/appointments/', appointment_async_views.appointment_list),
+
+    # Request metrics (REQUEST_METRICS=1)
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
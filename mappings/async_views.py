@@ -0,0 +1,28 @@
+from rest_framework import status
+
+from core.async_api import async_api_view, json_response
+from patients.models import Patient
+from .models import PatientDoctorMapping
+from .serializers import PatientDoctorMappingSerializer
+
+
+@async_api_view
+async def patient_doctors(request, patient_id):
+    """Async counterpart of ``GET /api/mappings/patient/{id}/``."""
+    try:
+        patient = await Patient.objects.only('user').aget(id=patient_id)
+    except Patient.DoesNotExist:
+        return json_response({'detail': 'No Patient matches the given query.'}, status.HTTP_404_NOT_FOUND)
+    
+    # Check if patient belongs to the user
+    if patient.user_id != request.user.id:
+        return json_response(
+            {'error': 'You can only view doctors for your own patients'},
+            status.HTTP_403_FORBIDDEN
+        )
+    
+    mappings = [
+        mapping async for mapping in
+        PatientDoctorMapping.objects.filter(patient_id=patient.id, is_active=True).with_names()
+    ]
+    return json_response(PatientDoctorMappingSerializer(mappings, many=True).data)
@@ -0,0 +1,38 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Now
+
+from doctors.cache import bump_directory_version
+from doctors.models import Doctor
+from .models import PatientDoctorMapping
+
+
+def adjust_active_patient_count(doctor_id, delta):
+    """Add ``delta`` to one doctor's counter in a single UPDATE, never going below zero."""
+    Doctor.objects.filter(pk=doctor_id).update(
+        active_patient_count=Greatest(F('active_patient_count') + delta, Value(0)),
+        updated_at=Now(),
+    )
+    bump_directory_version()
+
+
+def active_patient_count_subquery():
+    return Coalesce(Subquery(
+        PatientDoctorMapping.objects.filter(doctor=OuterRef('pk'), is_active=True)
+        .order_by()
+        .values('doctor')
+        .annotate(count=Count('pk'))
+        .values('count')
+    ), Value(0))
+
+
+def refresh_active_patient_counts(doctors=None):
+    """
+    Recount ``Doctor.active_patient_count`` from the mapping table with one
+    UPDATE. ``doctors`` is a queryset or iterable of ids; every doctor when None.
+    """
+    queryset = Doctor.objects.all()
+    if doctors is not None:
+        queryset = queryset.filter(pk__in=doctors)
+    updated = queryset.update(active_patient_count=active_patient_count_subquery(), updated_at=Now())
+    bump_directory_version()
+    return updated
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("doctors", "0002_cursor_pagination_index"),
+        ("mappings", "0001_initial"),
+        ("patients", "0002_cursor_pagination_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="patientdoctormapping",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="mappings_pa_created_4f4ef5_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("doctors", "0004_doctor_search_index"),
+        ("mappings", "0002_cursor_pagination_index"),
+        ("patients", "0005_patient_date_of_birth_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="patientdoctormapping",
+            index=models.Index(
+                fields=["patient", "is_active"], name="mappings_pa_patient_576893_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="patientdoctormapping",
+            index=models.Index(
+                fields=["doctor", "is_active"], name="mappings_pa_doctor__5df528_idx"
+            ),
+        ),
+        # The indexes above lead with the foreign keys, so their own indexes are redundant
+        migrations.AlterField(
+            model_name="patientdoctormapping",
+            name="doctor",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="patient_mappings",
+                to="doctors.doctor",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="patientdoctormapping",
+            name="patient",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="doctor_mappings",
+                to="patients.patient",
+            ),
+        ),
+    ]
@@ -1,21 +1,73 @@
 # mappings/models.py
 from django.db import models
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat
 from django.contrib.auth.models import User
 from patients.models import Patient
 from doctors.models import Doctor
 
+class PatientDoctorMappingQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Mappings of the user's patients or of the user's doctors. Each side is
+        an ``IN`` over the user's own ids, so the database reads two index
+        ranges and merges them, instead of joining both tables to test
+        ``patient.user_id OR doctor.user_id`` on every mapping row.
+        """
+        return self.filter(
+            Q(patient_id__in=Patient.objects.filter(user_id=user.id).values('pk'))
+            | Q(doctor_id__in=Doctor.objects.filter(user_id=user.id).values('pk'))
+        )
+    
+    def with_names(self):
+        """
+        Annotate the display names rendered by PatientDoctorMappingSerializer
+        so listing mappings does not load the related rows one at a time.
+        """
+        return self.annotate(
+            patient_name=Concat(
+                F('patient__first_name'), Value(' '), F('patient__last_name'),
+                output_field=models.CharField(),
+            ),
+            doctor_name=Concat(
+                Value('Dr. '), F('doctor__first_name'), Value(' '), F('doctor__last_name'),
+                output_field=models.CharField(),
+            ),
+            assigned_by_username=F('assigned_by__username'),
+        )
+
+
 class PatientDoctorMapping(models.Model):
-    patient = models.ForeignKey(Patient, on_delete=models.CASCADE, related_name='doctor_mappings')
-    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='patient_mappings')
+    # The (patient, is_active) and (doctor, is_active) indexes lead with these columns
+    patient = models.ForeignKey(
+        Patient, on_delete=models.CASCADE, related_name='doctor_mappings', db_index=False,
+    )
+    doctor = models.ForeignKey(
+        Doctor, on_delete=models.CASCADE, related_name='patient_mappings', db_index=False,
+    )
     assigned_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='assignments')
     assigned_date = models.DateField(auto_now_add=True)
     reason_for_assignment = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = PatientDoctorMappingQuerySet.as_manager()
     
     class Meta:
         unique_together = ['patient', 'doctor']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['patient', 'is_active']),
+            models.Index(fields=['doctor', 'is_active']),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The doctor whose active_patient_count currently includes this row
+        instance._counted_doctor_id = instance.doctor_id if instance.is_active else None
+        return instance
     
     def __str__(self):
         return f"{self.patient.first_name} {self.patient.last_name} - Dr. {self.doctor.first_name} {self.doctor.last_name}"
\ No newline at end of file
@@ -1,14 +1,12 @@
 # mappings/serializers.py
 from rest_framework import serializers
 from .models import PatientDoctorMapping
-# We'll import these later after migrations
-# from patients.serializers import PatientListSerializer
-# from doctors.serializers import DoctorListSerializer
 
 class PatientDoctorMappingSerializer(serializers.ModelSerializer):
-    # patient_details = PatientListSerializer(source='patient', read_only=True)
-    # doctor_details = DoctorListSerializer(source='doctor', read_only=True)
-    assigned_by_username = serializers.CharField(source='assigned_by.username', read_only=True)
+    # Read from the columns annotated by PatientDoctorMappingQuerySet.with_names()
+    patient_name = serializers.CharField(read_only=True)
+    doctor_name = serializers.CharField(read_only=True)
+    assigned_by_username = serializers.CharField(read_only=True, allow_null=True)
     
     class Meta:
         model = PatientDoctorMapping
@@ -20,8 +18,3 @@ class PatientDoctorMappingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = PatientDoctorMapping
         fields = ('patient', 'doctor', 'reason_for_assignment', 'is_active')
-
-class PatientWithDoctorsSerializer(serializers.Serializer):
-    patient_id = serializers.IntegerField()
-    patient_name = serializers.CharField()
-    doctors = serializers.ListField(child=serializers.DictField())
\ No newline at end of file
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .counters import adjust_active_patient_count
+from .models import PatientDoctorMapping
+
+
+@receiver(post_save, sender=PatientDoctorMapping)
+def update_active_patient_count(sender, instance, **kwargs):
+    # Rows loaded from the database remember which doctor they were counted
+    # against (see PatientDoctorMapping.from_db); new rows start uncounted
+    old = getattr(instance, '_counted_doctor_id', None)
+    new = instance.doctor_id if instance.is_active else None
+    if old == new:
+        return
+    if old is not None:
+        adjust_active_patient_count(old, -1)
+    if new is not None:
+        adjust_active_patient_count(new, 1)
+    instance._counted_doctor_id = new
+
+
+@receiver(post_delete, sender=PatientDoctorMapping)
+def release_active_patient_count(sender, instance, **kwargs):
+    old = getattr(instance, '_counted_doctor_id', None)
+    if old is not None:
+        adjust_active_patient_count(old, -1)
+        instance._counted_doctor_id = None
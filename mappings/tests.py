@@ -1,3 +1,269 @@
-from django.test import TestCase
+from datetime import date
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from doctors.models import Doctor
+from patients.models import Patient
+from .models import PatientDoctorMapping
+
+
+class MappingQueryCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.patient = Patient.objects.create(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+
+    def add_mappings(self, count):
+        start = Doctor.objects.count()
+        for i in range(start, start + count):
+            doctor = Doctor.objects.create(
+                user=self.user, first_name=f'Doc{i}', last_name='Test',
+                specialization='GP', contact_number='555', license_number=f'LIC{i}',
+                hospital='General',
+            )
+            PatientDoctorMapping.objects.create(
+                patient=self.patient, doctor=doctor, assigned_by=self.user,
+            )
+
+    def test_list_query_count_is_independent_of_row_count(self):
+        self.add_mappings(1)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/mappings/')
+        self.assertEqual(len(response.data['results']), 1)
+
+        self.add_mappings(4)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/mappings/')
+        self.assertEqual(len(response.data['results']), 5)
+
+        row = response.data['results'][0]
+        self.assertEqual(row['patient_name'], 'Ada Lovelace')
+        self.assertEqual(row['doctor_name'], 'Dr. Doc4 Test')
+        self.assertEqual(row['assigned_by_username'], 'owner')
+
+    def test_patient_doctors_query_count_is_independent_of_row_count(self):
+        url = f'/api/mappings/patient/{self.patient.id}/'
+        self.add_mappings(1)
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+        self.add_mappings(4)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data), 5)
+
+
+class MappingVisibilityTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass12345')
+        self.other = User.objects.create_user(username='other', password='pass12345')
+        self.stranger = User.objects.create_user(username='stranger', password='pass12345')
+        own_doctor = self.add_doctor(self.owner, 'LIC1')
+        other_doctor = self.add_doctor(self.other, 'LIC2')
+        # Both sides owned, the patient side only, the doctor side only
+        self.both = self.assign(self.add_patient(self.owner), own_doctor)
+        self.own_patient = self.assign(self.add_patient(self.owner), other_doctor)
+        self.own_doctor = self.assign(self.add_patient(self.other), own_doctor)
+        self.hidden = self.assign(self.add_patient(self.other), other_doctor)
+
+    def add_doctor(self, user, license_number):
+        return Doctor.objects.create(
+            user=user, first_name='Doc', last_name='Test', specialization='GP',
+            contact_number='555', license_number=license_number, hospital='General',
+        )
+
+    def add_patient(self, user):
+        return Patient.objects.create(
+            user=user, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+
+    def assign(self, patient, doctor):
+        return PatientDoctorMapping.objects.create(patient=patient, doctor=doctor)
+
+    def visible_ids(self, user):
+        self.client.force_authenticate(user)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/mappings/')
+        return sorted(row['id'] for row in response.data['results'])
+
+    def test_patient_or_doctor_owners_see_each_mapping_once(self):
+        self.assertEqual(
+            self.visible_ids(self.owner), sorted([self.both.id, self.own_patient.id, self.own_doctor.id])
+        )
+        self.assertEqual(
+            self.visible_ids(self.other), sorted([self.own_patient.id, self.own_doctor.id, self.hidden.id])
+        )
+        self.assertEqual(self.visible_ids(self.stranger), [])
+        self.client.force_authenticate(self.stranger)
+        self.assertEqual(self.client.get(f'/api/mappings/{self.both.id}/').status_code, 404)
+
+    def test_visibility_reads_the_mapping_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Plan text is SQLite specific')
+        plan = PatientDoctorMapping.objects.visible_to(self.owner).explain()
+        self.assertIn('MULTI-INDEX OR', plan)
+        self.assertNotIn('SCAN mappings_patientdoctormapping', plan)
+
+
+class MappingBulkTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.other = User.objects.create_user(username='other', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.patient = self.add_patient(self.user)
+        self.foreign_patient = self.add_patient(self.other)
+        self.doctors = [
+            Doctor.objects.create(
+                user=self.user, first_name=f'Doc{i}', last_name='Test',
+                specialization='GP', contact_number='555', license_number=f'LIC{i}',
+                hospital='General',
+            )
+            for i in range(3)
+        ]
+        PatientDoctorMapping.objects.create(patient=self.patient, doctor=self.doctors[0])
+
+    def add_patient(self, user):
+        return Patient.objects.create(
+            user=user, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+
+    def test_bulk_assign_checks_ownership_and_uniqueness_per_row(self):
+        rows = [
+            {'patient': self.patient.id, 'doctor': self.doctors[1].id},
+            {'patient': self.patient.id, 'doctor': self.doctors[0].id},
+            {'patient': self.foreign_patient.id, 'doctor': self.doctors[2].id},
+            {'patient': self.patient.id, 'doctor': 999999},
+            {'patient': self.patient.id, 'doctor': self.doctors[2].id},
+        ]
+        # Patients and doctors are loaded once each, uniqueness is one query
+        # and the touched doctors' counters are recounted in one UPDATE
+        with self.assertNumQueries(7):
+            response = self.client.post('/api/mappings/bulk/', rows, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(len(response.data['created']), 2)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 3])
+        self.assertEqual(
+            PatientDoctorMapping.objects.filter(patient=self.patient, assigned_by=self.user).count(), 2
+        )
+        self.assertEqual(
+            list(Doctor.objects.order_by('pk').values_list('active_patient_count', flat=True)), [1, 1, 1]
+        )
+
+
+class ActivePatientCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.doctor = Doctor.objects.create(
+            user=self.user, first_name='Gregory', last_name='House',
+            specialization='GP', contact_number='555', license_number='LIC1',
+            hospital='General',
+        )
+        self.patients = [
+            Patient.objects.create(
+                user=self.user, first_name=f'Ada{i}', last_name='Lovelace',
+                date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+            )
+            for i in range(2)
+        ]
+
+    def count(self):
+        return Doctor.objects.get(pk=self.doctor.pk).active_patient_count
+
+    def test_counter_follows_assignments(self):
+        for patient in self.patients:
+            response = self.client.post(
+                '/api/mappings/', {'patient': patient.id, 'doctor': self.doctor.id}, format='json'
+            )
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.count(), 2)
+
+        mapping = PatientDoctorMapping.objects.get(patient=self.patients[0])
+        response = self.client.patch(f'/api/mappings/{mapping.id}/', {'is_active': False}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.count(), 1)
+
+        # Saving again without a change leaves the counter alone
+        mapping = PatientDoctorMapping.objects.get(pk=mapping.pk)
+        mapping.save()
+        self.assertEqual(self.count(), 1)
+
+        self.patients[1].delete()
+        self.assertEqual(self.count(), 0)
+
+    def test_rebuild_counters_recounts_from_scratch(self):
+        PatientDoctorMapping.objects.create(patient=self.patients[0], doctor=self.doctor)
+        PatientDoctorMapping.objects.create(patient=self.patients[1], doctor=self.doctor, is_active=False)
+        Doctor.objects.update(active_patient_count=7)
+
+        call_command('rebuild_counters', batch_size=1, stdout=StringIO())
+        self.assertEqual(self.count(), 1)
+
+
+class AsyncPatientDoctorsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.patient = Patient.objects.create(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+        for i in range(2):
+            doctor = Doctor.objects.create(
+                user=self.user, first_name=f'Doc{i}', last_name='Test',
+                specialization='GP', contact_number='555', license_number=f'LIC{i}',
+                hospital='General',
+            )
+            PatientDoctorMapping.objects.create(patient=self.patient, doctor=doctor, assigned_by=self.user)
+
+    def test_matches_the_sync_endpoint(self):
+        sync = self.client.get(f'/api/mappings/patient/{self.patient.id}/')
+        response = self.client.get(f'/api/async/mappings/patient/{self.patient.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync.json())
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(self.client.get('/api/async/mappings/patient/999999/').status_code, 404)
+
+    def test_other_users_patients_are_forbidden(self):
+        other = User.objects.create_user(username='other', password='pass12345')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(other)}')
+        response = self.client.get(f'/api/async/mappings/patient/{self.patient.id}/')
+        self.assertEqual(response.status_code, 403)
+
+
+class MappingIdempotencyTests(APITestCase):
+    def test_retried_assignment_is_replayed(self):
+        cache.clear()
+        user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(user)
+        patient = Patient.objects.create(
+            user=user, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+        doctor = Doctor.objects.create(
+            user=user, first_name='Greg', last_name='House',
+            specialization='GP', contact_number='555', license_number='LIC1',
+            hospital='General',
+        )
+        payload = {'patient': patient.id, 'doctor': doctor.id}
+        first = self.client.post('/api/mappings/', payload, format='json', HTTP_IDEMPOTENCY_KEY='assign-1')
+        self.assertEqual(first.status_code, 201)
+
+        retry = self.client.post('/api/mappings/', payload, format='json', HTTP_IDEMPOTENCY_KEY='assign-1')
+        self.assertEqual((retry.status_code, retry.data), (201, first.data))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        # Without a key the retry is validated again and refused as a duplicate
+        self.assertEqual(self.client.post('/api/mappings/', payload, format='json').status_code, 400)
+        self.assertEqual(PatientDoctorMapping.objects.count(), 1)
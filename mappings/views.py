@@ -1,30 +1,23 @@
-from django.shortcuts import render
-from rest_framework import viewsets, permissions, status, generics
+from rest_framework import viewsets, permissions, serializers, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
+from core.bulk import BulkModelMixin
+from core.idempotency import IdempotentCreateMixin
+from .counters import refresh_active_patient_counts
 from .models import PatientDoctorMapping
 from patients.models import Patient
-from doctors.models import Doctor
-from .serializers import (
-    PatientDoctorMappingSerializer, 
-    PatientDoctorMappingCreateSerializer,
-    PatientWithDoctorsSerializer
-)
+from .serializers import PatientDoctorMappingSerializer, PatientDoctorMappingCreateSerializer
 
-class PatientDoctorMappingViewSet(viewsets.ModelViewSet):
+class PatientDoctorMappingViewSet(IdempotentCreateMixin, BulkModelMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         # Users can see mappings where they are the patient's owner or doctor's owner
-        return PatientDoctorMapping.objects.filter(
-            patient__user=self.request.user
-        ) | PatientDoctorMapping.objects.filter(
-            doctor__user=self.request.user
-        )
+        return PatientDoctorMapping.objects.visible_to(self.request.user).with_names()
     
     def get_serializer_class(self):
-        if self.action in ['create', 'update', 'partial_update']:
+        if self.action in ['create', 'update', 'partial_update', 'bulk']:
             return PatientDoctorMappingCreateSerializer
         return PatientDoctorMappingSerializer
     
@@ -47,32 +40,43 @@ class PatientDoctorMappingViewSet(viewsets.ModelViewSet):
         
         serializer.save(assigned_by=self.request.user)
     
+    def get_bulk_save_kwargs(self):
+        return {'assigned_by': self.request.user}
+    
+    def validate_bulk_row(self, attrs, instance=None):
+        # Patients are preloaded by the bulk action, so compare ids without another query
+        patient = attrs.get('patient')
+        if patient is not None and patient.user_id != self.request.user.id:
+            raise serializers.ValidationError(
+                {'error': 'You can only assign doctors to your own patients'}
+            )
+    
+    def perform_bulk_create(self, objs):
+        super().perform_bulk_create(objs)
+        # bulk_create skips the post_save counters, so recount the touched doctors
+        refresh_active_patient_counts({obj.doctor_id for obj in objs})
+        for obj in objs:
+            obj._counted_doctor_id = obj.doctor_id if obj.is_active else None
+    
+    def perform_bulk_update(self, objs, fields):
+        super().perform_bulk_update(objs, fields)
+        doctor_ids = {obj.doctor_id for obj in objs}
+        doctor_ids.update(obj._counted_doctor_id for obj in objs if obj._counted_doctor_id is not None)
+        refresh_active_patient_counts(doctor_ids)
+        for obj in objs:
+            obj._counted_doctor_id = obj.doctor_id if obj.is_active else None
+    
     @action(detail=False, methods=['GET'], url_path='patient/(?P<patient_id>\d+)')
     def get_patient_doctors(self, request, patient_id=None):
         patient = get_object_or_404(Patient, id=patient_id)
         
         # Check if patient belongs to the user
-        if patient.user != request.user:
+        if patient.user_id != request.user.id:
             return Response(
                 {'error': 'You can only view doctors for your own patients'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        mappings = PatientDoctorMapping.objects.filter(patient=patient, is_active=True)
+        mappings = PatientDoctorMapping.objects.filter(patient=patient, is_active=True).with_names()
         serializer = PatientDoctorMappingSerializer(mappings, many=True)
         return Response(serializer.data)
-
-
-class PatientDoctorsView(generics.ListAPIView):
-    permission_classes = [permissions.IsAuthenticated]
-    serializer_class = PatientDoctorMappingSerializer
-    
-    def get_queryset(self):
-        patient_id = self.kwargs['patient_id']
-        patient = get_object_or_404(Patient, id=patient_id)
-        
-        # Check if patient belongs to the user
-        if patient.user != self.request.user:
-            return PatientDoctorMapping.objects.none()
-        
-        return PatientDoctorMapping.objects.filter(patient=patient, is_active=True)
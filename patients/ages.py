@@ -0,0 +1,34 @@
+from datetime import date
+
+
+def age_on(date_of_birth, today):
+    """Completed years between ``date_of_birth`` and ``today``."""
+    return today.year - date_of_birth.year - ((today.month, today.day) < (date_of_birth.month, date_of_birth.day))
+
+
+def birth_date_cutoff(today, years):
+    """
+    The latest date of birth of someone at least ``years`` old on ``today``.
+
+    ``age >= n`` is ``date_of_birth <= birth_date_cutoff(today, n)`` and
+    ``age <= n`` is ``date_of_birth > birth_date_cutoff(today, n + 1)``, both
+    plain range conditions on the indexed column.
+    """
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:
+        # 29 February with no leap day that year: born on the 28th, you already are
+        return today.replace(year=today.year - years, day=28)
+
+
+def request_today(request):
+    """
+    The date ages are computed against, fixed once per request so filters,
+    annotations and validators agree even across midnight.
+    """
+    if request is None:
+        return date.today()
+    today = getattr(request, '_patients_today', None)
+    if today is None:
+        today = request._patients_today = date.today()
+    return today
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def repair_search_index(sender, **kwargs):
+    # Imported here so startup does not load the search module (and DRF)
+    from .search import patient_search
+
+    patient_search.repair_after_migrate(**kwargs)
 
 
 class PatientsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "patients"
+
+    def ready(self):
+        post_migrate.connect(repair_search_index, sender=self)
@@ -0,0 +1,16 @@
+# patients/async_views.py
+from core.async_api import async_api_view, json_response, paginated_response
+from .ages import request_today
+from .filters import PatientFilter
+from .models import Patient
+from .serializers import PatientListSerializer
+
+
+@async_api_view
+async def patient_list(request):
+    """Async counterpart of ``GET /api/patients/``."""
+    queryset = Patient.objects.filter(user_id=request.user.id).with_age(request_today(request))
+    filterset = PatientFilter(request.GET, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        return json_response(filterset.errors, 400)
+    return await paginated_response(request, filterset.qs, PatientListSerializer)
@@ -0,0 +1,48 @@
+import django_filters
+from django import forms
+from rest_framework.filters import OrderingFilter
+from .ages import birth_date_cutoff, request_today
+from .models import Patient
+
+
+# Also keeps birth_date_cutoff() clear of date's year 1 lower bound
+MAX_AGE = 150
+
+
+class AgeFilter(django_filters.NumberFilter):
+    field_class = forms.IntegerField
+
+
+class PatientFilter(django_filters.FilterSet):
+    # ?age_min=65&age_max=80 in completed years, answered as a date_of_birth
+    # range so the (user, date_of_birth) index is used instead of computing ages
+    age_min = AgeFilter(method='filter_age_min', min_value=0, max_value=MAX_AGE)
+    age_max = AgeFilter(method='filter_age_max', min_value=0, max_value=MAX_AGE)
+
+    class Meta:
+        model = Patient
+        fields = ['gender', 'age_min', 'age_max']
+
+    def filter_age_min(self, queryset, name, value):
+        return queryset.filter(date_of_birth__lte=birth_date_cutoff(request_today(self.request), value))
+
+    def filter_age_max(self, queryset, name, value):
+        return queryset.filter(date_of_birth__gt=birth_date_cutoff(request_today(self.request), value + 1))
+
+
+class PatientOrderingFilter(OrderingFilter):
+    """
+    ``?ordering=age`` / ``?ordering=-age`` sorted on the indexed date_of_birth
+    column (youngest first is latest birth date first). ``id`` is appended as a
+    tie-breaker so cursor pages stay stable.
+    """
+    aliases = {'age': '-date_of_birth', '-age': 'date_of_birth'}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        ordering = [self.aliases.get(term, term) for term in ordering]
+        if not any(term.lstrip('-') in ('id', 'pk') for term in ordering):
+            ordering.append('-id')
+        return ordering
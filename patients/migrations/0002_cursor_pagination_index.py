@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="patients_pa_user_id_50f6f4_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0002_cursor_pagination_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="patient",
+            name="upcoming_appointment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
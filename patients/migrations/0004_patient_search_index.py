@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from patients.search import patient_search
+
+
+def install(apps, schema_editor):
+    patient_search.install(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    patient_search.uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0003_patient_upcoming_appointment_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-18 14:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0004_patient_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(
+                fields=["user", "date_of_birth"], name="patients_pa_user_id_e935f0_idx"
+            ),
+        ),
+    ]
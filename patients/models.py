@@ -1,6 +1,22 @@
 from django.db import models
+from django.db.models import CharField, IntegerField, Value
+from django.db.models.functions import Cast, Replace
 from django.contrib.auth.models import User
 
+
+class PatientQuerySet(models.QuerySet):
+    def with_age(self, today):
+        """
+        Annotate ``age`` in completed years on ``today``, computed by the
+        database: (YYYYMMDD of today - YYYYMMDD of birth) / 10000.
+        """
+        # ISO date text with the dashes removed; native string functions on
+        # every backend, unlike Extract() which SQLite runs as a Python function
+        birth = Cast(Replace(Cast('date_of_birth', CharField()), Value('-'), Value('')), IntegerField())
+        today = Value(today.year * 10000 + today.month * 100 + today.day)
+        return self.annotate(age=(today - birth) / 10000)
+
+
 class Patient(models.Model):
     GENDER_CHOICES = [
         ('M', 'Male'),
@@ -17,11 +33,20 @@ class Patient(models.Model):
     email = models.EmailField(blank=True)
     address = models.TextField(blank=True)
     medical_history = models.TextField(blank=True)
+    # SCHEDULED appointments, maintained by appointments.signals
+    upcoming_appointment_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = PatientQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id']),
+            # ?age_min= / ?age_max= and ?ordering=age are date_of_birth ranges and sorts
+            models.Index(fields=['user', 'date_of_birth']),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
\ No newline at end of file
@@ -0,0 +1,4 @@
+from core.search import SearchIndex
+
+# Front-desk lookups: name, phone or email
+patient_search = SearchIndex('patients_patient', ('first_name', 'last_name', 'contact_number', 'email'))
@@ -1,5 +1,7 @@
 # patients/serializers.py
 from rest_framework import serializers
+from doctors.serializers import DoctorListSerializer
+from .ages import age_on
 from .models import Patient
 from datetime import date
 
@@ -10,27 +12,31 @@ class PatientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Patient
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('upcoming_appointment_count', 'created_at', 'updated_at')
     
     def get_age(self, obj):
-        today = date.today()
-        age = today.year - obj.date_of_birth.year
-        if today.month < obj.date_of_birth.month or (today.month == obj.date_of_birth.month and today.day < obj.date_of_birth.day):
-            age -= 1
-        return age
+        return age_on(obj.date_of_birth, self.context.get('today') or date.today())
 
 
 class PatientListSerializer(serializers.ModelSerializer):
-    age = serializers.SerializerMethodField()
+    # Annotated by Patient.objects.with_age(), so lists never compute ages in Python
+    age = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Patient
         fields = ('id', 'first_name', 'last_name', 'date_of_birth', 'gender', 
-                 'contact_number', 'email', 'age', 'created_at')
+                 'contact_number', 'email', 'age', 'upcoming_appointment_count', 'created_at')
+
+
+class PatientWithDoctorsSerializer(serializers.ModelSerializer):
+    doctors = serializers.SerializerMethodField()
     
-    def get_age(self, obj):
-        today = date.today()
-        age = today.year - obj.date_of_birth.year
-        if today.month < obj.date_of_birth.month or (today.month == obj.date_of_birth.month and today.day < obj.date_of_birth.day):
-            age -= 1
-        return age
\ No newline at end of file
+    class Meta:
+        model = Patient
+        fields = ('id', 'first_name', 'last_name', 'date_of_birth', 
+                 'gender', 'contact_number', 'email', 'doctors')
+    
+    def get_doctors(self, obj):
+        # Expects the queryset to prefetch active mappings into `active_doctor_mappings`
+        doctors = [mapping.doctor for mapping in obj.active_doctor_mappings]
+        return DoctorListSerializer(doctors, many=True).data
@@ -1,3 +1,310 @@
-from django.test import TestCase
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models.signals import post_migrate
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from doctors.models import Doctor
+from mappings.models import PatientDoctorMapping
+from .models import Patient
+from .search import patient_search
+from .serializers import PatientListSerializer
+
+
+class PatientWithDoctorsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.doctors = [
+            Doctor.objects.create(
+                user=self.user, first_name=f'Doc{i}', last_name='Test',
+                specialization='GP', contact_number='555', license_number=f'LIC{i}',
+                hospital='General',
+            )
+            for i in range(3)
+        ]
+
+    def add_patient(self, name, doctors, inactive=()):
+        patient = Patient.objects.create(
+            user=self.user, first_name=name, last_name='Patient',
+            date_of_birth=date(1990, 1, 1), gender='O', contact_number='555',
+        )
+        for doctor in doctors:
+            PatientDoctorMapping.objects.create(patient=patient, doctor=doctor)
+        for doctor in inactive:
+            PatientDoctorMapping.objects.create(patient=patient, doctor=doctor, is_active=False)
+        return patient
+
+    def test_roster_is_loaded_in_constant_queries(self):
+        self.add_patient('One', self.doctors[:1])
+        with self.assertNumQueries(2):
+            self.client.get('/api/patients/with-doctors/')
+
+        self.add_patient('Two', self.doctors)
+        self.add_patient('Three', self.doctors[1:], inactive=self.doctors[:1])
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/patients/with-doctors/')
+
+        self.assertEqual(response.status_code, 200)
+        rosters = {row['first_name']: row['doctors'] for row in response.data['results']}
+        self.assertEqual(len(rosters['One']), 1)
+        self.assertEqual(len(rosters['Two']), 3)
+        self.assertEqual(
+            sorted(doctor['id'] for doctor in rosters['Three']),
+            sorted(doctor.id for doctor in self.doctors[1:]),
+        )
+
+    def test_care_team_of_one_patient(self):
+        patient = self.add_patient('One', self.doctors[:2], inactive=self.doctors[2:])
+        # Patient lookup, then the mappings with names joined
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/patients/{patient.id}/doctors/')
+        self.assertEqual(sorted(row['doctor'] for row in response.data), [doctor.id for doctor in self.doctors[:2]])
+        self.assertEqual(response.data[0]['patient_name'], 'One Patient')
+
+
+class PatientConditionalRequestTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.patient = Patient.objects.create(
+            user=self.user, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+        self.url = f'/api/patients/{self.patient.id}/'
+
+    def test_matching_validators_return_304_after_one_lookup(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+        not_modified = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_stale_if_match_is_rejected(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.patch(self.url, {'first_name': 'Augusta'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.client.patch(self.url, {'first_name': 'Stale'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.patient.refresh_from_db()
+        self.assertEqual(self.patient.first_name, 'Augusta')
+
+
+class PatientOwnershipTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass12345')
+        self.other = User.objects.create_user(username='other', password='pass12345')
+        self.patient = Patient.objects.create(
+            user=self.owner, first_name='Ada', last_name='Lovelace',
+            date_of_birth=date(1990, 1, 1), gender='F', contact_number='555',
+        )
+        self.url = f'/api/patients/{self.patient.id}/'
+
+    def test_owner_update_is_one_fetch_and_one_update(self):
+        self.client.force_authenticate(self.owner)
+        with self.assertNumQueries(2):
+            response = self.client.patch(self.url, {'address': '12 St James Sq'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['address'], '12 St James Sq')
+
+    def test_other_users_get_404(self):
+        self.client.force_authenticate(self.other)
+        with self.assertNumQueries(1):
+            response = self.client.patch(self.url, {'address': 'Elsewhere'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.delete(self.url).status_code, 404)
+        self.assertTrue(Patient.objects.filter(pk=self.patient.pk, address='').exists())
+
+
+class PatientSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.other = User.objects.create_user(username='other', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.ada = self.add_patient(self.user, 'Ada', 'Lovelace', '555-0101', 'ada@example.com')
+        self.alan = self.add_patient(self.user, 'Alan', 'Turing', '555-0199', 'alan@example.com')
+        self.add_patient(self.other, 'Ada', 'Byron', '555-0101', 'byron@example.com')
+
+    def add_patient(self, user, first_name, last_name, contact_number, email):
+        return Patient.objects.create(
+            user=user, first_name=first_name, last_name=last_name, date_of_birth=date(1990, 1, 1),
+            gender='O', contact_number=contact_number, email=email,
+        )
+
+    def search(self, query):
+        response = self.client.get('/api/patients/', {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_prefix_search_over_name_phone_and_email(self):
+        self.assertEqual(self.search('ada lov'), [self.ada.id])
+        self.assertEqual(self.search('0199'), [self.alan.id])
+        self.assertEqual(self.search('alan@exam'), [self.alan.id])
+        self.assertEqual(sorted(self.search('555')), sorted([self.ada.id, self.alan.id]))
+        self.assertEqual(self.search('grace'), [])
+        self.assertEqual(self.search('"*'), [])
+
+    def test_ranks_through_one_join(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.search('ada'), [self.ada.id])
+        if connection.vendor != 'sqlite':
+            return
+        # The FTS table is searched once, not once per candidate row
+        plan = patient_search.search(Patient.objects.filter(user=self.user), 'ada').explain()
+        self.assertEqual(plan.count('VIRTUAL TABLE'), 1)
+        self.assertNotIn('CORRELATED', plan)
+
+    def test_index_follows_writes(self):
+        self.ada.last_name = 'King'
+        self.ada.save()
+        self.assertEqual(self.search('lovelace'), [])
+        self.assertEqual(self.search('king'), [self.ada.id])
+
+        self.alan.delete()
+        self.assertEqual(self.search('turing'), [])
+
+    def test_migrate_reinstalls_dropped_triggers(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Triggers are SQLite specific')
+        # What SQLite does to the triggers when a migration remakes the table
+        with connection.cursor() as cursor:
+            for name in patient_search.trigger_names:
+                cursor.execute(f'DROP TRIGGER {connection.ops.quote_name(name)}')
+        self.assertEqual(patient_search.missing_triggers(connection), patient_search.trigger_names)
+
+        out = StringIO()
+        post_migrate.send(apps.get_app_config('patients'), app_config=apps.get_app_config('patients'),
+                          verbosity=1, interactive=False, using=connection.alias, stdout=out)
+        self.assertEqual(patient_search.missing_triggers(connection), [])
+        self.assertIn('Reinstalled search triggers', out.getvalue())
+        grace = self.add_patient(self.user, 'Grace', 'Hopper', '555-0142', 'grace@example.com')
+        self.assertEqual(self.search('hopper'), [grace.id])
+
+
+class AsyncPatientListTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.other = User.objects.create_user(username='other', password='pass12345')
+        for user, count in ((self.user, 3), (self.other, 1)):
+            for i in range(count):
+                Patient.objects.create(
+                    user=user, first_name=f'P{i}', last_name=user.username,
+                    date_of_birth=date(1990, 1, 1), gender='O', contact_number='555',
+                )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_matches_the_sync_list(self):
+        sync = self.client.get('/api/patients/')
+        response = self.client.get('/api/async/patients/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], sync.json()['results'])
+
+    def test_keyset_pages_cover_every_row_once(self):
+        response = self.client.get('/api/async/patients/', {'page_size': 2})
+        first = response.json()
+        self.assertEqual(len(first['results']), 2)
+
+        second = self.client.get(first['next']).json()
+        self.assertIsNone(second['next'])
+        ids = [row['id'] for row in first['results'] + second['results']]
+        self.assertEqual(ids, list(self.user.patients.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+        self.assertEqual(self.client.get('/api/async/patients/', {'cursor': 'bogus'}).status_code, 404)
+
+    def test_requires_a_token_and_allows_reads_only(self):
+        self.assertEqual(self.client.post('/api/async/patients/').status_code, 405)
+        self.client.credentials()
+        response = self.client.get('/api/async/patients/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+
+
+class PatientListFastPathTests(APITestCase):
+    def test_list_bytes_match_the_model_serializer(self):
+        user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(user)
+        for name in ('Zoë', 'Line\u2028break', 'Plain'):
+            Patient.objects.create(
+                user=user, first_name=name, last_name='Test', date_of_birth=date(1990, 6, 15),
+                gender='O', contact_number='555', email='',
+            )
+
+        expected = JSONRenderer().render({
+            'next': None,
+            'previous': None,
+            'results': PatientListSerializer(
+                user.patients.with_age(date.today()).order_by('-created_at', '-id'), many=True,
+            ).data,
+        })
+        self.assertEqual(self.client.get('/api/patients/').content, expected)
+
+
+class PatientAgeTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pass12345')
+        self.client.force_authenticate(self.user)
+        self.today = date(2024, 2, 29)
+        births = {
+            'Leapling': date(2000, 2, 29),
+            'Eve': date(2000, 3, 1),
+            'Senior': date(1959, 2, 28),
+            'Junior': date(1959, 3, 1),
+            'Child': date(2014, 2, 28),
+        }
+        for name, born in births.items():
+            Patient.objects.create(
+                user=self.user, first_name=name, last_name='Test', date_of_birth=born,
+                gender='O', contact_number='555',
+            )
+
+    def names(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [row['first_name'] for row in response.data['results']]
+
+    def test_sql_ages_match_python(self):
+        from .ages import age_on
+        for today in (self.today, date(2025, 2, 28), date(2025, 3, 1), date(2024, 12, 31)):
+            for patient in Patient.objects.with_age(today):
+                self.assertEqual(patient.age, age_on(patient.date_of_birth, today), (today, patient.date_of_birth))
+
+    def test_age_brackets_and_ordering(self):
+        with patch('patients.ages.date') as mock_date:
+            mock_date.today.return_value = self.today
+            self.assertEqual(self.names(self.client.get('/api/patients/?age_min=65')), ['Senior'])
+            self.assertEqual(
+                sorted(self.names(self.client.get('/api/patients/?age_min=10&age_max=24'))),
+                ['Child', 'Eve', 'Leapling'],
+            )
+            self.assertEqual(self.names(self.client.get('/api/patients/?age_max=23')), ['Child', 'Eve'])
+            response = self.client.get('/api/patients/?ordering=-age')
+            self.assertEqual(self.names(response), ['Senior', 'Junior', 'Leapling', 'Eve', 'Child'])
+            self.assertEqual([row['age'] for row in response.data['results']], [65, 64, 24, 23, 10])
+            self.assertEqual(self.client.get('/api/patients/?age_min=ten').status_code, 400)
+
+    def test_out_of_range_age_is_rejected(self):
+        for query in ('age_min=99999', 'age_max=99999', 'age_min=151', 'age_max=-1'):
+            self.assertEqual(self.client.get(f'/api/patients/?{query}').status_code, 400, query)
+        self.assertEqual(self.names(self.client.get('/api/patients/?age_min=150&age_max=150')), [])
+
+    def test_age_ordering_pages_with_the_cursor(self):
+        response = self.client.get('/api/patients/?ordering=age&page_size=2')
+        seen = self.names(response)
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += self.names(response)
+        self.assertEqual(seen, ['Child', 'Eve', 'Leapling', 'Junior', 'Senior'])
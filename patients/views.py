@@ -2,33 +2,93 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from datetime import datetime, time
+from django.db.models import Prefetch
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from core.bulk import BulkModelMixin
+from core.conditional import ConditionalRequestMixin
+from core.export import ExportMixin
+from core.fastpath import FastListMixin
+from core.ownership import OwnerScopedMixin
+from core.search import SearchMixin
+from mappings.models import PatientDoctorMapping
+from mappings.serializers import PatientDoctorMappingSerializer
+from .ages import request_today
+from .filters import PatientFilter, PatientOrderingFilter
 from .models import Patient
-from .serializers import PatientSerializer, PatientListSerializer
+from .search import patient_search
+from .serializers import PatientSerializer, PatientListSerializer, PatientWithDoctorsSerializer
 
-class PatientViewSet(viewsets.ModelViewSet):
+class PatientViewSet(OwnerScopedMixin, BulkModelMixin, ExportMixin, ConditionalRequestMixin, SearchMixin,
+                     FastListMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    export_fields = ('id', 'first_name', 'last_name', 'date_of_birth', 'gender', 'contact_number',
+                     'email', 'address', 'medical_history', 'created_at', 'updated_at')
+    search_index = patient_search
+    filter_backends = [DjangoFilterBackend, PatientOrderingFilter]
+    filterset_class = PatientFilter
+    ordering_fields = ['age', 'date_of_birth', 'created_at']
+    # Every method, reads included, only sees the user's own patients
+    owner_scoped_methods = ()
     
     def get_queryset(self):
-        return Patient.objects.filter(user=self.request.user)
+        queryset = self.owned(Patient.objects.all())
+        if self.action == 'list':
+            queryset = queryset.with_age(request_today(self.request))
+        return queryset
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['today'] = request_today(self.request)
+        return context
     
     def get_serializer_class(self):
         if self.action == 'list':
             return PatientListSerializer
+        if self.action == 'with_doctors':
+            return PatientWithDoctorsSerializer
         return PatientSerializer
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
     
+    # The serialized age changes with the date, so validators do too
+    def get_etag_parts(self, instance):
+        return super().get_etag_parts(instance) + [request_today(self.request).isoformat()]
+    
+    def get_last_modified(self, instance):
+        return max(instance.updated_at, timezone.make_aware(datetime.combine(request_today(self.request), time.min)))
+    
+    @action(detail=False, methods=['GET'], url_path='with-doctors')
+    def with_doctors(self, request):
+        # Two queries per page: the patients, then every active mapping joined to its doctor
+        active_mappings = PatientDoctorMapping.objects.filter(is_active=True).select_related('doctor')
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(
+            Prefetch('doctor_mappings', queryset=active_mappings, to_attr='active_doctor_mappings')
+        )
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['GET'])
+    def doctors(self, request, pk=None):
+        # Active care team of one of the user's patients, names joined in one query
+        patient = self.get_object()
+        mappings = PatientDoctorMapping.objects.filter(patient=patient, is_active=True).with_names()
+        serializer = PatientDoctorMappingSerializer(mappings, many=True)
+        return Response(serializer.data)
+    
+    # Another user's patient is not in get_queryset(), so writes to it are a 404
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
-        
-        # Check if the patient belongs to the current user
-        if instance.user != request.user:
-            return Response(
-                {'error': 'You do not have permission to update this patient.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        self.check_preconditions(request, instance)
         
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
@@ -37,17 +97,11 @@ class PatientViewSet(viewsets.ModelViewSet):
         if getattr(instance, '_prefetched_objects_cache', None):
             instance._prefetched_objects_cache = {}
         
-        return Response(serializer.data)
+        return Response(serializer.data, headers=self.get_validator_headers(instance))
     
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        
-        # Check if the patient belongs to the current user
-        if instance.user != request.user:
-            return Response(
-                {'error': 'You do not have permission to delete this patient.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        self.check_preconditions(request, instance)
         
         self.perform_destroy(instance)
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)